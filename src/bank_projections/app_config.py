@@ -18,6 +18,7 @@ from pydantic import BaseModel, field_validator
 
 from bank_projections.financials.balance_sheet_metric_registry import BalanceSheetMetrics
 from bank_projections.utils.base_registry import BaseRegistry
+from bank_projections.utils.parsing import strip_identifier
 
 # Default config paths relative to this module
 DEFAULT_CONFIG_PATH = Path(__file__).parent / "app_config.yaml"
@@ -34,6 +35,7 @@ KeywordType = Literal[
     "Classification",
     "MutationMetric",
 ]
+IdentifierKind = Literal["label", "date", "classification"]
 
 
 class DictionaryEntry(BaseModel):
@@ -93,6 +95,7 @@ class AppConfig(BaseModel):
     dictionary: list[DictionaryEntry] = []
 
     _registry_cache: dict[str, type[BaseRegistry[Any]]] | None = None
+    _identifier_index_cache: dict[str, tuple[IdentifierKind, str]] | None = None
 
     def get_dictionary_entries(self, keyword_type: KeywordType | None = None) -> list[DictionaryEntry]:
         """Get dictionary entries, optionally filtered by metric type."""
@@ -118,6 +121,23 @@ class AppConfig(BaseModel):
             object.__setattr__(self, "_registry_cache", classifications)
         return self._registry_cache  # type: ignore[return-value]
 
+    def identifier_index(self) -> dict[str, tuple[IdentifierKind, str]]:
+        """Get a lookup from stripped identifier to its kind and canonical column name, caching the result."""
+        if self._identifier_index_cache is None:
+            index: dict[str, tuple[IdentifierKind, str]] = {}
+            groups: list[tuple[IdentifierKind, list[str]]] = [
+                ("label", self.balance_sheet_labels()),
+                ("date", self.date_columns()),
+                ("classification", list(self.get_classifications().keys())),
+            ]
+            for kind, columns in groups:
+                for column in columns:
+                    stripped = strip_identifier(column)
+                    if stripped is not None:
+                        index.setdefault(stripped, (kind, column))
+            object.__setattr__(self, "_identifier_index_cache", index)
+        return self._identifier_index_cache  # type: ignore[return-value]
+
     def balance_sheet_labels(self) -> list[str]:
         """Get balance sheet label columns from dictionary."""
         return [e.keyword for e in self.get_dictionary_entries("Label")]
@@ -149,7 +169,7 @@ class AppConfig(BaseModel):
         return (
             self.balance_sheet_labels()
             + list(self.get_classifications().keys())
-            + BalanceSheetMetrics.stored_columns()
+            + list(BalanceSheetMetrics.stored_columns())
             + self.date_columns()
         )
 
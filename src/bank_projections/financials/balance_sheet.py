@@ -1,5 +1,8 @@
+import contextlib
 import copy
 import datetime
+import functools
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -10,11 +13,7 @@ from bank_projections.app_config import Config
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem, BalanceSheetItemRegistry
 from bank_projections.financials.balance_sheet_metric_registry import BalanceSheetMetrics
-from bank_projections.financials.balance_sheet_metrics import (
-    SMALL_NUMBER,
-    BalanceSheetMetric,
-    StoredColumn,
-)
+from bank_projections.financials.balance_sheet_metrics import SMALL_NUMBER, BalanceSheetMetric
 from bank_projections.output_config import AggregationConfig
 from bank_projections.projections.accrual_method import AccrualMethodRegistry
 from bank_projections.projections.frequency import FrequencyRegistry
@@ -31,6 +30,12 @@ class MutationReason:
     def add_to_df(self, df: pl.DataFrame) -> pl.DataFrame:
         return df.with_columns(**{k: pl.lit(v) for k, v in self.reasons.items()})
 
+    def aggregate(self, data: pl.DataFrame, expr: pl.Expr, labels: list[str]) -> pl.DataFrame:
+        # Group on the data labels only; the reason labels are constant and are attached to the (small) result
+        keys = [label for label in labels if label not in self.reasons]
+        amounts = data.group_by(keys).agg(Amount=expr.sum()) if keys else data.select(Amount=expr.sum())
+        return amounts.pipe(self.add_to_df).select([*labels, "Amount"])
+
     def add_identifier(self, key: str, value: Any) -> "MutationReason":
         reasons = self.reasons.copy()
         if pd.isna(value) or value == "":
@@ -42,15 +47,51 @@ class MutationReason:
         return hash(tuple(sorted(self.reasons.items())))
 
 
+@functools.lru_cache(maxsize=16)
+def aggregation_plan(
+    requests: tuple[tuple[BalanceSheetItem, BalanceSheetMetric], ...],
+) -> tuple[tuple[tuple[pl.Expr, tuple[pl.Expr, ...]], ...], tuple[tuple[int, int], ...]]:
+    # Group the requests into one filter and select per selection of rows, so that common subexpressions of the
+    # metrics (e.g. book value in the HQLA metrics) are computed once. The plan only depends on the requests, so it is
+    # built once and reused for every balance sheet. Returns the (filter, aggregations) queries and, per request, the
+    # (query, column) position of its result
+    groups: list[tuple[BalanceSheetItem, list[BalanceSheetMetric]]] = []
+    positions = []
+    for item, metric in requests:
+        # Separately constructed items can still select the same rows
+        query = next(
+            (i for i, (other, _) in enumerate(groups) if other.filter_expression.meta.eq(item.filter_expression)),
+            len(groups),
+        )
+        if query == len(groups):
+            groups.append((item, []))
+        metrics = groups[query][1]
+        if metric not in metrics:
+            metrics.append(metric)
+        positions.append((query, metrics.index(metric)))
+
+    queries = tuple(
+        (item.filter_expression, tuple(metric.aggregation_expression.alias(str(i)) for i, metric in enumerate(metrics)))
+        for item, metrics in groups
+    )
+    return queries, tuple(positions)
+
+
 class Positions(Combinable):
     def __init__(self, data: pl.DataFrame):
         self._data = Config.cast_columns(data)
+        self._prefetched_amounts: dict[tuple[BalanceSheetItem, BalanceSheetMetric], float] = {}
 
     def validate(self) -> None:
         if len(self) == 0:
             raise ValueError("Positions data cannot be empty")
 
         for column, registry in Config.get_classifications().items():
+            # Classification columns are cast to an Enum of the registry names on construction, which already
+            # rejects invalid values, so only fall back to the row-wise check if the dtype was lost
+            dtype = self._data.schema.get(column)
+            if isinstance(dtype, pl.Enum) and set(dtype.categories.to_list()) <= set(registry.stripped_names()):
+                continue
             if not self._data.select(pl.col(column).is_in(registry.stripped_names()).all()).item():
                 invalid_values = (
                     self._data.filter(~pl.col(column).is_in(registry.stripped_names()))
@@ -63,10 +104,11 @@ class Positions(Combinable):
                     f"Valid values are: {list(registry.stripped_names())}"
                 )
 
-        missing_columns = set(Config.required_columns()) - set(self._data.columns)
+        required_columns = set(Config.required_columns())
+        missing_columns = required_columns - set(self._data.columns)
         if missing_columns:
             raise ValueError(f"Positions data is missing required columns: {missing_columns}")
-        extra_columns = set(self._data.columns) - set(Config.required_columns())
+        extra_columns = set(self._data.columns) - required_columns
         if extra_columns:
             raise ValueError(f"Positions data contains unexpected extra columns: {extra_columns}")
 
@@ -83,9 +125,30 @@ class Positions(Combinable):
     def get_amount(self, item: BalanceSheetItem, metric: BalanceSheetMetric | str) -> float:
         if isinstance(metric, str):
             metric = BalanceSheetMetrics.get(metric)
-        result = self._data.filter(item.filter_expression).select(metric.aggregation_expression).item()
+        prefetched = self._prefetched_amounts.get((item, metric))
+        if prefetched is not None:
+            return prefetched
+        # Lazy, so that only the columns used by the filter and the metric are read
+        result = self._data.lazy().filter(item.filter_expression).select(metric.aggregation_expression).collect().item()
         return float(result)
 
+    def get_amounts(self, requests: Sequence[tuple[BalanceSheetItem, BalanceSheetMetric]]) -> list[float]:
+        # Evaluate all aggregations in a single collect, so Polars can run them in parallel on the same data
+        queries, positions = aggregation_plan(tuple(requests))
+        data = self._data.lazy()
+        results = pl.collect_all([data.filter(filter_expression).select(exprs) for filter_expression, exprs in queries])
+        return [float(results[query][0, column]) for query, column in positions]
+
+    @contextlib.contextmanager
+    def prefetch_amounts(self, requests: Sequence[tuple[BalanceSheetItem, BalanceSheetMetric]]) -> Iterator[None]:
+        # Serve get_amount for these item/metric combinations from one fused evaluation; the data must not be
+        # modified while the prefetched amounts are in use
+        self._prefetched_amounts = dict(zip(requests, self.get_amounts(requests), strict=True))
+        try:
+            yield
+        finally:
+            self._prefetched_amounts = {}
+
     @staticmethod
     def combine(*positions: "Positions") -> "Positions":
         if len(positions) < 1:
@@ -98,7 +161,7 @@ class Positions(Combinable):
 
 
 class BalanceSheet(Positions):
-    def __init__(self, data: pl.DataFrame, date: datetime.date):
+    def __init__(self, data: pl.DataFrame, date: datetime.date, skip_validate: bool = False):
         super().__init__(data)
         self.date = date
         self.add_item(
@@ -116,10 +179,13 @@ class BalanceSheet(Positions):
         self.pnls = pl.DataFrame(schema=pnl_schema)
         self.ocis = pl.DataFrame(schema=oci_schema)
 
-        self.validate()
+        if not skip_validate:
+            self.validate()
 
     def initialize_new_date(self, date: datetime.date) -> "BalanceSheet":
-        return BalanceSheet(self._data, date)
+        # The data comes from an existing balance sheet and only gets zero-valued accounts added, so the full
+        # validation is left to the caller (the projection validates after every rule)
+        return BalanceSheet(self._data, date, skip_validate=True)
 
     def validate(self) -> None:
         super().validate()
@@ -168,6 +234,8 @@ class BalanceSheet(Positions):
                 f"Cash in balance sheet and cashflow table do not match: {total_cash_bs:.4f} vs {total_cash_table:.4f}"
             )
 
+        self._data = self._data.rechunk()
+
     def add_item(
         self,
         based_on_item: BalanceSheetItem | None,
@@ -192,10 +260,9 @@ class BalanceSheet(Positions):
             origination_date = self.date
 
         # Find the number of rows and total nominal of the based_on_item
-        based_on_nominal, based_on_count = (
-            self._data.filter(based_on_item.filter_expression).select(
-                [pl.col("Nominal").sum().alias("total"), pl.col("Nominal").count().alias("count")]
-            )
+        based_on_data = self._data.filter(based_on_item.filter_expression)
+        based_on_nominal, based_on_count = based_on_data.select(
+            [pl.col("Nominal").sum().alias("total"), pl.col("Nominal").count().alias("count")]
         ).row(0)
         if based_on_count == 0:
             raise ValueError(f"No item found on balance sheet matching: {based_on_item}")
@@ -203,17 +270,15 @@ class BalanceSheet(Positions):
             # Add a small number to avoid division by zero
             # TODO: Check if this is really needed, but not already covered by the metrics module
             self._data = self._data.with_columns(Nominal=pl.col("Nominal") + SMALL_NUMBER)
+            based_on_data = based_on_data.with_columns(Nominal=pl.col("Nominal") + SMALL_NUMBER)
 
         # Find unique labels for non-numeric columns
         non_numeric_cols = self._data.select([pl.col(pl.Utf8), pl.col(pl.Boolean)]).columns
-        n_uniques = self._data.filter(based_on_item.filter_expression).select(
-            [pl.col(col).n_unique().alias(col) for col in non_numeric_cols]
-        )
+        n_uniques = based_on_data.select([pl.col(col).n_unique().alias(col) for col in non_numeric_cols])
         constant_cols = [c for c in non_numeric_cols if n_uniques[0, c] == 1]
 
         new_data = (
-            self._data.filter(based_on_item.filter_expression)
-            .with_columns(
+            based_on_data.with_columns(
                 **{label: pl.lit(value) for label, value in labels.items()},
                 OriginationDate=pl.lit(origination_date),
                 MaturityDate=pl.lit(maturity_date, dtype=pl.Date),
@@ -224,13 +289,7 @@ class BalanceSheet(Positions):
                 | set(Config.get_classifications().keys() | set(labels.keys()))
                 | {"OriginationDate", "MaturityDate"}
             )
-            .agg(
-                [
-                    metric.aggregation_expression.alias(metric.column)
-                    for metric in BalanceSheetMetrics.values()
-                    if isinstance(metric, StoredColumn)
-                ]
-            )
+            .agg(*BalanceSheetMetrics.stored_aggregation_expressions())
             .with_columns(
                 PreviousCouponDate=FrequencyRegistry.previous_coupon_date(
                     self.date, anchor_date=pl.coalesce("MaturityDate", "OriginationDate")
@@ -307,7 +366,10 @@ class BalanceSheet(Positions):
             for mut_reason, pnl_expr in pnls.items():
                 self.add_pnl(new_data, pnl_expr, mut_reason)
 
-        self._data = pl.concat([self._data, new_data], how="diagonal")
+        # Column sets are equal (checked above), so align the order and take the cheap row-append path
+        new_data = new_data.select(self._data.columns)
+        # Rechunking is deferred to validate/aggregate, so repeated appends do not copy the full frame
+        self._data = pl.concat([self._data, new_data], how="vertical_relaxed", rechunk=False)
 
         if offset_pnl is not None or offset_liquidity is not None:
             number_of_offsets = sum(
@@ -415,51 +477,72 @@ class BalanceSheet(Positions):
                 "BookValueBefore"
             )
 
-        if self._data.filter(item.filter_expression).is_empty():
+        # Materialize all calculations in one pass, split off the filtered rows for the pnl/cashflow/oci
+        # bookings and drop the ephemeral columns at once
+        data = self._data.with_columns(**calculations)
+        mutated = data.filter(item.filter_expression)
+        if mutated.is_empty():
             raise ValueError(f"No item found on balance sheet matching: {item}")
 
-        self._data = self._data.with_columns(**calculations)
+        pnl_columns = [f"pnl_{i}" for i in range(len(pnls or {}))]
+        cashflow_columns = [f"cashflow_{i}" for i in range(len(cashflows or {}))]
+        oci_columns = [f"oci_{i}" for i in range(len(ocis or {}))]
+        ephemeral_columns = pnl_columns + cashflow_columns + oci_columns
+
+        if ephemeral_columns:
+            null_counts = mutated.select(ephemeral_columns).null_count().row(0, named=True)
+            for columns, name in ((pnl_columns, "PnL"), (cashflow_columns, "Liquidity"), (oci_columns, "OCI")):
+                if any(null_counts[column] > 0 for column in columns):
+                    raise ValueError(f"{name} expression contains null values")
+
+            # Aggregate all pnl/cashflow/oci amounts in a single group by over the union of the label columns,
+            # each booking below then only regroups this small summary
+            label_columns = [
+                label
+                for label in dict.fromkeys(Config.pnl_labels() + Config.cashflow_labels() + Config.oci_labels())
+                if label in mutated.columns
+            ]
+            sums = [pl.col(column).sum() for column in ephemeral_columns]
+            mutated = mutated.group_by(label_columns).agg(sums) if label_columns else mutated.select(sums)
+
+        self._data = data.drop(ephemeral_columns)
 
         # Process PnL mutations
         if pnls is not None:
-            for i, (mut_reason, _) in enumerate(pnls.items()):
-                pnl_col = f"pnl_{i}"
-                self.add_pnl(self._data.filter(item.filter_expression), pl.col(pnl_col), mut_reason)
-                self._data = self._data.drop(pnl_col)
+            for pnl_col, mut_reason in zip(pnl_columns, pnls.keys(), strict=True):
+                self.add_pnl(mutated, pl.col(pnl_col), mut_reason)
 
         # Process cashflow mutations
         if cashflows is not None:
-            for i, (mut_reason, _) in enumerate(cashflows.items()):
-                cashflow_col = f"cashflow_{i}"
-                self.add_liquidity(self._data.filter(item.filter_expression), pl.col(cashflow_col), mut_reason)
-                self._data = self._data.drop(cashflow_col)
+            for cashflow_col, mut_reason in zip(cashflow_columns, cashflows.keys(), strict=True):
+                self.add_liquidity(mutated, pl.col(cashflow_col), mut_reason)
 
         # Process OCI mutations
         if ocis is not None:
-            for i, (mut_reason, _) in enumerate(ocis.items()):
-                oci_col = f"oci_{i}"
-                self.add_oci(self._data.filter(item.filter_expression), pl.col(oci_col), mut_reason)
-                self._data = self._data.drop(oci_col)
+            for oci_col, mut_reason in zip(oci_columns, ocis.keys(), strict=True):
+                self.add_oci(mutated, pl.col(oci_col), mut_reason)
+
+        if offset_pnl is not None or offset_liquidity is not None or counter_item is not None:
+            # Filter the mutated rows once for all offset bookings
+            item_data = self._data.filter(item.filter_expression)
 
         if offset_pnl is not None:
             self.add_pnl(
-                self._data.filter(item.filter_expression),
+                item_data,
                 BalanceSheetMetrics.get("book value signed").get_expression - pl.col("BookValueBefore"),
                 offset_pnl,
             )
         if offset_liquidity is not None:
             self.add_liquidity(
-                self._data.filter(item.filter_expression),
+                item_data,
                 -(BalanceSheetMetrics.get("book value signed").get_expression - pl.col("BookValueBefore")),
                 offset_liquidity,
             )
 
         if counter_item is not None:
-            book_value_change = (
-                self._data.filter(item.filter_expression)
-                .select((BalanceSheetMetrics.get("book value signed").get_expression - pl.col("BookValueBefore")).sum())
-                .item()
-            )
+            book_value_change = item_data.select(
+                (BalanceSheetMetrics.get("book value signed").get_expression - pl.col("BookValueBefore")).sum()
+            ).item()
 
             sign = -self.get_item_book_value_sign(counter_item)
 
@@ -472,9 +555,11 @@ class BalanceSheet(Positions):
 
     def get_item_book_value_sign(self, item: BalanceSheetItem) -> int:
         signs = (
-            self._data.filter(item.filter_expression)
+            self._data.lazy()
+            .filter(item.filter_expression)
             .select(BalanceSheetCategoryRegistry.book_value_sign())
             .unique()
+            .collect()
             .to_series(0)
         )
 
@@ -490,7 +575,7 @@ class BalanceSheet(Positions):
         if data.filter(expr.is_null()).height > 0:
             raise ValueError("PnL expression contains null values")
 
-        pnls = data.pipe(reason.add_to_df).group_by(Config.pnl_labels()).agg(Amount=expr.sum())
+        pnls = reason.aggregate(data, expr, Config.pnl_labels())
         pnls = pnls.filter(pl.col("Amount") != 0.0)
 
         self.pnls = pl.concat([self.pnls, pnls], how="diagonal")
@@ -528,7 +613,7 @@ class BalanceSheet(Positions):
         if data.filter(expr.is_null()).height > 0:
             raise ValueError("OCI expression contains null values")
 
-        ocis = data.pipe(reason.add_to_df).group_by(Config.oci_labels()).agg(Amount=expr.sum())
+        ocis = reason.aggregate(data, expr, Config.oci_labels())
         ocis = ocis.filter(pl.col("Amount") != 0.0)
 
         self.ocis = pl.concat([self.ocis, ocis], how="diagonal")
@@ -563,7 +648,7 @@ class BalanceSheet(Positions):
         if data.filter(expr.is_null()).height > 0:
             raise ValueError("Liquidity expression contains null values")
 
-        cashflows = data.pipe(reason.add_to_df).group_by(Config.cashflow_labels()).agg(Amount=expr.sum())
+        cashflows = reason.aggregate(data, expr, Config.cashflow_labels())
         cashflows = cashflows.filter(pl.col("Amount") != 0.0)
 
         self.cashflows = pl.concat([self.cashflows, cashflows], how="diagonal")
@@ -602,36 +687,38 @@ class BalanceSheet(Positions):
     def aggregate(
         self, aggregation_config: AggregationConfig
     ) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, pl.DataFrame]:
+        self._data = self._data.rechunk()
+        data = self._data.lazy()
         if aggregation_config.balance_sheet is None:
-            bs = self._data.with_columns(
-                [metric.get_expression.alias(name) for name, metric in BalanceSheetMetrics.items.items()]
-            )
+            bs = data.with_columns(*BalanceSheetMetrics.expressions())
         else:
             bs = (
-                self._data.group_by(aggregation_config.balance_sheet + list(Config.get_classifications().keys()))
-                .agg([metric.aggregation_expression.alias(name) for name, metric in BalanceSheetMetrics.items.items()])
+                data.group_by(aggregation_config.balance_sheet + list(Config.get_classifications().keys()))
+                .agg(*BalanceSheetMetrics.aggregation_expressions())
                 .sort(by=aggregation_config.balance_sheet)
             )
 
-        # TODO: Some repetition here, can be cleaned up
-        return (
-            bs,
-            self.pnls
-            if aggregation_config.pnl is None
-            else self.pnls.group_by(aggregation_config.pnl).agg([pl.col("Amount").sum().alias("Amount")]),
-            self.cashflows
-            if aggregation_config.cashflow is None
-            else self.cashflows.group_by(aggregation_config.cashflow).agg([pl.col("Amount").sum().alias("Amount")]),
-            self.ocis
-            if aggregation_config.oci is None
-            else self.ocis.group_by(aggregation_config.oci).agg([pl.col("Amount").sum().alias("Amount")]),
+        def aggregate_amounts(df: pl.DataFrame, labels: list[str] | None) -> pl.LazyFrame:
+            if labels is None:
+                return df.lazy()
+            return df.lazy().group_by(labels).agg([pl.col("Amount").sum().alias("Amount")])
+
+        # The four aggregations are independent, so they are collected together and run in parallel
+        agg_bs, pnls, cashflows, ocis = pl.collect_all(
+            [
+                bs,
+                aggregate_amounts(self.pnls, aggregation_config.pnl),
+                aggregate_amounts(self.cashflows, aggregation_config.cashflow),
+                aggregate_amounts(self.ocis, aggregation_config.oci),
+            ]
         )
+        return agg_bs, pnls, cashflows, ocis
 
     @classmethod
     def get_differences(cls, bs1: "BalanceSheet", bs2: "BalanceSheet") -> pl.DataFrame:
-        numeric_cols = [c for c, dt in zip(bs1._data.columns, bs2._data.dtypes, strict=False) if dt.is_numeric()]
+        numeric_cols = [c for c, dt in bs1._data.schema.items() if dt.is_numeric()]
 
-        # Compute differences only on numeric cols
+        # Compute differences only on numeric cols, in one select that leaves both balance sheets untouched
         diff_df: pl.DataFrame = bs1._data.select([(pl.col(c) - bs2._data[c]).alias(f"Delta_{c}") for c in numeric_cols])
 
         return diff_df
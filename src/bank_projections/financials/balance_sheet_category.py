@@ -1,8 +1,9 @@
+import functools
 from abc import ABC, abstractmethod
 
 import polars as pl
 
-from bank_projections.financials.balance_sheet_metrics import MarketValue
+from bank_projections.financials.balance_sheet_metrics import MARKET_VALUE
 from bank_projections.utils.base_registry import BaseRegistry
 
 
@@ -45,7 +46,7 @@ class SideDependsOnMarketValue(BalanceSheetCategory):
 
     @property
     def is_asset_side(self) -> pl.Expr:
-        return MarketValue().get_expression >= 0
+        return MARKET_VALUE.get_expression >= 0
 
 
 class SideDependsOnNominal(BalanceSheetCategory):
@@ -59,8 +60,16 @@ class SideDependsOnNominal(BalanceSheetCategory):
 
 
 class BalanceSheetCategoryRegistry(BaseRegistry[BalanceSheetCategory]):
+    @classmethod
+    def register(cls, name: str, item: BalanceSheetCategory) -> None:
+        super().register(name, item)
+        # The cached expressions below depend on the registered categories
+        cls.book_value_sign.cache_clear()  # type: ignore[attr-defined]
+        cls.is_asset_side_expr.cache_clear()  # type: ignore[attr-defined]
+
     # TODO: Consider having book value sign as a metric, simplifying this registry
     @classmethod
+    @functools.cache
     def book_value_sign(cls) -> pl.Expr:
         expr = pl.lit(1)
         for name, category_cls in cls.stripped_items.items():
@@ -69,6 +78,7 @@ class BalanceSheetCategoryRegistry(BaseRegistry[BalanceSheetCategory]):
         return expr
 
     @classmethod
+    @functools.cache
     def is_asset_side_expr(cls) -> pl.Expr:
         expr = pl.lit(True)
         for name, category_cls in cls.stripped_items.items():
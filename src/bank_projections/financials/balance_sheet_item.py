@@ -1,17 +1,28 @@
 import datetime
+import functools
+import sys
 from typing import Any, Literal
 
-import pandas as pd
 import polars as pl
 from dateutil.relativedelta import relativedelta
 
 from bank_projections.app_config import Config
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.utils.base_registry import BaseRegistry
-from bank_projections.utils.parsing import get_identifier, is_in_identifiers, read_date, strip_identifier
+from bank_projections.utils.parsing import is_missing, read_date, strip_identifier
+
+ALWAYS_TRUE = pl.lit(True)
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def column_equals(column: str, value: Any) -> pl.Expr:
+    # Items often share the same identifier conditions (e.g. ItemType == "Cash"), so reuse the expressions
+    return pl.col(column) == value
 
 
 class Cohort:
+    __slots__ = ("age", "unit", "minimum", "maximum", "_offset", "_next_offset")
+
     def __init__(
         self, age: int, unit: Literal["days", "months", "years"], minimum: bool = False, maximum: bool = False
     ) -> None:
@@ -24,6 +35,16 @@ class Cohort:
         if unit not in ("days", "months", "years"):
             raise ValueError(f"Unit '{unit}' must be 'days', 'months', or 'years'")
 
+        # Precompute the offsets; plain timedeltas suffice (and are much cheaper) for day-based cohorts
+        self._offset: datetime.timedelta | relativedelta
+        self._next_offset: datetime.timedelta | relativedelta
+        if unit == "days":
+            self._offset = datetime.timedelta(days=age)
+            self._next_offset = datetime.timedelta(days=age + 1)
+        else:
+            self._offset = relativedelta(**{unit: age})
+            self._next_offset = relativedelta(**{unit: age + 1})
+
     @staticmethod
     def from_string(label: str, value: int) -> "Cohort":
         if label.startswith("minage"):
@@ -44,61 +65,74 @@ class Cohort:
         return Cohort(age=value, unit=unit, minimum=minimum, maximum=maximum)
 
     def get_expression(self, reference_date: datetime.date) -> pl.Expr:
-        offset_date = reference_date - relativedelta(**{self.unit: self.age})
+        offset_date = reference_date - self._offset
 
         if self.minimum:
             return pl.col("OriginationDate") >= pl.lit(offset_date)
         elif self.maximum:
             return pl.col("OriginationDate") <= pl.lit(offset_date)
         else:
-            offset_date2 = reference_date - relativedelta(**{self.unit: self.age + 1})
+            offset_date2 = reference_date - self._next_offset
             return (pl.col("OriginationDate") > pl.lit(offset_date2)) & (
                 pl.col("OriginationDate") <= pl.lit(offset_date)
             )
 
 
 class BalanceSheetItem:
+    __slots__ = ("identifiers", "expr", "_filter_expression")
+
     def __init__(self, expr: pl.Expr | None = None, **identifiers: Any) -> None:
         self.identifiers: dict[str, Any] = {}
         for key, value in identifiers.items():
             self._add_identifier(self.identifiers, key, value)
 
         self.expr = expr
+        self._filter_expression: pl.Expr | None = None
+
+    @classmethod
+    def _from_validated(cls, identifiers: dict[str, Any], expr: pl.Expr | None) -> "BalanceSheetItem":
+        """Create an item from identifiers that already went through _add_identifier, skipping re-validation."""
+        item = cls.__new__(cls)
+        item.identifiers = identifiers
+        item.expr = expr
+        item._filter_expression = None
+        return item
 
     @staticmethod
     def _add_identifier(identifiers: dict[str, Any], key: str, value: Any) -> None:
-        if pd.isna(value) or value == "":
+        if is_missing(value):
             raise ValueError(f"BalanceSheetItem {key} cannot be '{value}'")
-        elif is_in_identifiers(key, Config.balance_sheet_labels()):
-            key = get_identifier(key, Config.balance_sheet_labels())
-        elif is_in_identifiers(key, Config.date_columns()):
-            key = get_identifier(key, Config.date_columns())
-            value = read_date(value)
-        elif is_in_identifiers(key, Config.get_classifications()):
-            key = get_identifier(key, Config.get_classifications())
-            value = strip_identifier(value)
-        else:
+
+        entry = Config.identifier_index().get(strip_identifier(key))
+        if entry is None:
             raise ValueError(
                 f"Invalid identifier '{key}' for BalanceSheetItem. Valid identifiers are: {Config.label_columns()}"
             )
-        identifiers[key] = value
+        kind, key = entry
+        if kind == "date":
+            value = read_date(value)
+        elif kind == "classification":
+            value = strip_identifier(value)
+        # Keys are the canonical config column names; intern the (highly repetitive) string values as well so all
+        # items share one copy of e.g. "Cash" or "Retained earnings"
+        identifiers[key] = sys.intern(value) if isinstance(value, str) else value
 
     def add_identifier(self, key: str, value: Any) -> "BalanceSheetItem":
         identifiers = self.identifiers.copy()
         self._add_identifier(identifiers, key, value)
-        return BalanceSheetItem(expr=self.expr, **identifiers)
+        return self._from_validated(identifiers, self.expr)
 
     def add_condition(self, expr: pl.Expr) -> "BalanceSheetItem":
         new_expr = expr if self.expr is None else self.expr & expr
-        return BalanceSheetItem(expr=new_expr, **self.identifiers)
+        return self._from_validated(self.identifiers.copy(), new_expr)
 
     def remove_identifier(self, identifier: str) -> "BalanceSheetItem":
         identifiers = self.identifiers.copy()
         del identifiers[identifier]
-        return BalanceSheetItem(expr=self.expr, **identifiers)
+        return self._from_validated(identifiers, self.expr)
 
     def copy(self) -> "BalanceSheetItem":
-        return BalanceSheetItem(expr=self.expr, **self.identifiers.copy())
+        return self._from_validated(self.identifiers.copy(), self.expr)
 
     def add_cohort_expression(self, cohort: Cohort, reference_date: datetime.date) -> "BalanceSheetItem":
         expr = cohort.get_expression(reference_date)
@@ -113,20 +147,22 @@ class BalanceSheetItem:
 
     @property
     def filter_expression(self) -> pl.Expr:
-        expr = pl.all_horizontal(
-            ([pl.lit(True)] if self.expr is None else [self.expr])
-            + [pl.col(col) == val for col, val in self.identifiers.items()]
-        )
-        return expr
+        # Items are immutable (every modifier returns a new item), so the expression is built only once
+        if self._filter_expression is None:
+            expr = self.expr
+            for col, val in self.identifiers.items():
+                term = column_equals(col, val)
+                expr = term if expr is None else expr & term
+            self._filter_expression = ALWAYS_TRUE if expr is None else expr
+        return self._filter_expression
 
     def __and__(self, other: "BalanceSheetItem") -> "BalanceSheetItem":
-        # Check for conflicting identifiers
-        for key in self.identifiers.keys() & other.identifiers.keys():
-            if self.identifiers[key] != other.identifiers[key]:
+        # Combine identifiers, checking for conflicts in the same pass
+        combined_identifiers = self.identifiers.copy()
+        for key, value in other.identifiers.items():
+            if key in combined_identifiers and combined_identifiers[key] != value:
                 raise ValueError(f"Conflicting identifiers for BalanceSheetItem: {key}")
-
-        # Combine identifiers
-        combined_identifiers = {**self.identifiers, **other.identifiers}
+            combined_identifiers[key] = value
         if self.expr is None and other.expr is None:
             combined_expr = None
         elif self.expr is None:
@@ -136,10 +172,10 @@ class BalanceSheetItem:
         else:
             combined_expr = self.expr & other.expr
 
-        return BalanceSheetItem(expr=combined_expr, **combined_identifiers)
+        return self._from_validated(combined_identifiers, combined_expr)
 
     def __or__(self, other: "BalanceSheetItem") -> "BalanceSheetItem":
-        return BalanceSheetItem(expr=self.filter_expression | other.filter_expression)
+        return self._from_validated({}, self.filter_expression | other.filter_expression)
 
     def __repr__(self) -> str:
         return f"BalanceSheetItem(identifiers={self.identifiers}, expr={self.expr})"
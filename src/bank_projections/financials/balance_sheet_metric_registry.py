@@ -1,11 +1,17 @@
+import functools
+
 import polars as pl
 
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_metrics import (
-    HQLA,
+    BASEL_EXPOSURE,
+    BOOK_VALUE,
+    HQLA_AMOUNT,
+    MARKET_VALUE,
+    OFF_BALANCE_EXPOSURE,
+    ON_BALANCE_EXPOSURE,
+    QUANTITY,
     BalanceSheetMetric,
-    BaselExposure,
-    BookValue,
     DerivedAmount,
     DerivedMetric,
     DerivedWeight,
@@ -13,11 +19,7 @@ from bank_projections.financials.balance_sheet_metrics import (
     EncumberedHQLA,
     LeverageExposure,
     Limit,
-    MarketValue,
     MutationAmount,
-    OffBalanceExposure,
-    OnBalanceExposure,
-    Quantity,
     StoredAmount,
     StoredColumn,
     StoredWeight,
@@ -28,12 +30,49 @@ from bank_projections.utils.base_registry import BaseRegistry
 
 class BalanceSheetMetrics(BaseRegistry[BalanceSheetMetric]):
     @classmethod
-    def stored_columns(cls) -> list[str]:
-        return [metric.column for metric in cls.values() if isinstance(metric, StoredColumn)]
+    def register(cls, name: str, item: BalanceSheetMetric) -> None:
+        super().register(name, item)
+        # The cached lookups and expression lists below depend on the registered metrics
+        cls.get.cache_clear()  # type: ignore[attr-defined]
+        cls.stored_aggregation_expressions.cache_clear()  # type: ignore[attr-defined]
+        cls.aggregation_expressions.cache_clear()  # type: ignore[attr-defined]
+        cls.expressions.cache_clear()  # type: ignore[attr-defined]
+        cls.stored_columns.cache_clear()  # type: ignore[attr-defined]
+        cls.mutation_columns.cache_clear()  # type: ignore[attr-defined]
+
+    @classmethod
+    @functools.cache
+    def get(cls, name: str) -> BalanceSheetMetric:
+        return super().get(name)
+
+    @classmethod
+    @functools.cache
+    def stored_aggregation_expressions(cls) -> tuple[pl.Expr, ...]:
+        return tuple(
+            metric.aggregation_expression.alias(metric.column)
+            for metric in cls.values()
+            if isinstance(metric, StoredColumn)
+        )
+
+    @classmethod
+    @functools.cache
+    def aggregation_expressions(cls) -> tuple[pl.Expr, ...]:
+        return tuple(metric.aggregation_expression.alias(name) for name, metric in cls.items.items())
+
+    @classmethod
+    @functools.cache
+    def expressions(cls) -> tuple[pl.Expr, ...]:
+        return tuple(metric.get_expression.alias(name) for name, metric in cls.items.items())
+
+    @classmethod
+    @functools.cache
+    def stored_columns(cls) -> tuple[str, ...]:
+        return tuple(metric.column for metric in cls.values() if isinstance(metric, StoredColumn))
 
     @classmethod
-    def mutation_columns(cls) -> list[str]:
-        return [metric.column for metric in cls.values() if isinstance(metric, MutationAmount)]
+    @functools.cache
+    def mutation_columns(cls) -> tuple[str, ...]:
+        return tuple(metric.column for metric in cls.values() if isinstance(metric, MutationAmount))
 
 
 BalanceSheetMetrics.register("Nominal", StoredAmount("Nominal"))
@@ -47,23 +86,23 @@ BalanceSheetMetrics.register("Notional", StoredAmount("Notional"))
 BalanceSheetMetrics.register("AccruedInterestError", StoredAmount("AccruedInterestError"))
 
 BalanceSheetMetrics.register("ValuationError", StoredWeight("ValuationError"))
-BalanceSheetMetrics.register("MarketValue", MarketValue())
+BalanceSheetMetrics.register("MarketValue", MARKET_VALUE)
 
-BalanceSheetMetrics.register("Quantity", Quantity())
+BalanceSheetMetrics.register("Quantity", QUANTITY)
 BalanceSheetMetrics.register("CoverageRate", DerivedWeight("Impairment"))
 BalanceSheetMetrics.register("AccruedInterestWeight", DerivedWeight("AccruedInterest"))
 BalanceSheetMetrics.register("AgioWeight", DerivedWeight("Agio"))
 BalanceSheetMetrics.register("UndrawnPortion", DerivedWeight("Undrawn"))
 
-BalanceSheetMetrics.register("BookValue", BookValue())
+BalanceSheetMetrics.register("BookValue", BOOK_VALUE)
 
 
 class BookValueSigned(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return BalanceSheetCategoryRegistry.book_value_sign() * BookValue().get_expression
+        return BalanceSheetCategoryRegistry.book_value_sign() * BOOK_VALUE.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
@@ -72,9 +111,9 @@ BalanceSheetMetrics.register("BookValueSigned", BookValueSigned())
 BalanceSheetMetrics.register("DirtyPrice", DirtyPrice())
 
 BalanceSheetMetrics.register("OtherOffBalance", DerivedAmount("OtherOffBalanceWeight"))
-BalanceSheetMetrics.register("OnBalanceExposure", OnBalanceExposure())
-BalanceSheetMetrics.register("OffBalanceExposure", OffBalanceExposure())
-BalanceSheetMetrics.register("BaselExposure", BaselExposure())
+BalanceSheetMetrics.register("OnBalanceExposure", ON_BALANCE_EXPOSURE)
+BalanceSheetMetrics.register("OffBalanceExposure", OFF_BALANCE_EXPOSURE)
+BalanceSheetMetrics.register("BaselExposure", BASEL_EXPOSURE)
 BalanceSheetMetrics.register("LeverageExposure", LeverageExposure())
 BalanceSheetMetrics.register("Limit", Limit())
 
@@ -85,8 +124,8 @@ BalanceSheetMetrics.register("PrepaymentRate", StoredWeight("PrepaymentRate"))
 BalanceSheetMetrics.register("CCF", StoredWeight("CCF", pl.col("Undrawn")))
 
 
-BalanceSheetMetrics.register("TREAWeight", StoredWeight("TREAWeight", BaselExposure().get_expression))
-BalanceSheetMetrics.register("TREA", DerivedAmount("TREAWeight", BaselExposure().get_expression))
+BalanceSheetMetrics.register("TREAWeight", StoredWeight("TREAWeight", BASEL_EXPOSURE.get_expression))
+BalanceSheetMetrics.register("TREA", DerivedAmount("TREAWeight", BASEL_EXPOSURE.get_expression))
 
 BalanceSheetMetrics.register("EncumberedWeight", StoredWeight("EncumberedWeight"))
 BalanceSheetMetrics.register("Encumbered", DerivedAmount("EncumberedWeight"))
@@ -97,7 +136,7 @@ BalanceSheetMetrics.register("StableFunding", DerivedAmount("StableFundingWeight
 BalanceSheetMetrics.register("StressedOutflowWeight", StoredWeight("StressedOutflowWeight"))
 BalanceSheetMetrics.register("StressedOutflow", DerivedAmount("StressedOutflowWeight"))
 
-BalanceSheetMetrics.register("HQLA", HQLA())
+BalanceSheetMetrics.register("HQLA", HQLA_AMOUNT)
 BalanceSheetMetrics.register("EncumberedHQLA", EncumberedHQLA())
 BalanceSheetMetrics.register("UnencumberedHQLA", UnencumberedHQLA())
 
@@ -1,3 +1,4 @@
+import functools
 from abc import ABC, abstractmethod
 
 import polars as pl
@@ -7,6 +8,18 @@ from bank_projections.financials.hqla_class import HQLARegistry
 SMALL_NUMBER = 1e-12
 
 
+def nonzero(expr: pl.Expr) -> pl.Expr:
+    """Null out zeros, so that dividing by the result gives null instead of inf/NaN; callers fill that null"""
+    return pl.when(expr != 0).then(expr)
+
+
+def allocate(amount: float, allocation_expr: pl.Expr, filter_expression: pl.Expr) -> pl.Expr:
+    """Distribute amount pro rata over the filtered rows, or evenly if their allocations sum to zero"""
+    total = (filter_expression * allocation_expr).sum()
+    count = (filter_expression & allocation_expr.is_not_null()).sum()
+    return pl.when(total != 0).then(pl.lit(amount) * allocation_expr / total).otherwise(pl.lit(amount) / count)
+
+
 class BalanceSheetMetric(ABC):
     @property
     @abstractmethod
@@ -36,12 +49,12 @@ class StoredColumn(BalanceSheetMetric, ABC):
     def __init__(self, column: str):
         self.column = column
 
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col(self.column)
 
-    def set_expression(self, amounts: pl.Expr) -> pl.Expr:
-        return pl.lit(amounts)
+    def set_expression(self, amounts: pl.Expr | float) -> pl.Expr:
+        return amounts if isinstance(amounts, pl.Expr) else pl.lit(amounts)
 
     @property
     def mutation_column(self) -> str:
@@ -51,24 +64,31 @@ class StoredColumn(BalanceSheetMetric, ABC):
 class StoredAmount(StoredColumn):
     def __init__(self, column: str, allocation_col: str = "Nominal"):
         super().__init__(column)
-        self.allocation_expr = pl.col(allocation_col) + pl.lit(SMALL_NUMBER)  # Prevent division by zero
+        self.allocation_expr = pl.col(allocation_col)
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
     def mutation_expression(self, amount: float, filter_expression: pl.Expr) -> pl.Expr:
-        return pl.lit(amount) * self.allocation_expr / (filter_expression * self.allocation_expr).sum()
+        return allocate(amount, self.allocation_expr, filter_expression)
 
 
 class StoredWeight(StoredColumn):
-    def __init__(self, column: str, weight_expr: pl.Expr = pl.col("Nominal")):
+    def __init__(self, column: str, weight_expr: pl.Expr | None = None):
         super().__init__(column)
-        self.weight_expr = weight_expr + pl.lit(SMALL_NUMBER)  # Prevent division by zero
+        self.weight_expr = pl.col("Nominal") if weight_expr is None else weight_expr
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
-        return (pl.col(self.column) * self.weight_expr).sum() / self.weight_expr.sum()
+        # Weights summing to zero fall back to the unweighted mean, and an empty selection to zero
+        total_weight = self.weight_expr.sum()
+        return (
+            pl.when(total_weight != 0)
+            .then((pl.col(self.column) * self.weight_expr).sum() / total_weight)
+            .otherwise(pl.col(self.column).mean())
+            .fill_null(0.0)
+        )
 
     def mutation_expression(self, amount: float, filter_expression: pl.Expr) -> pl.Expr:
         return pl.lit(amount)
@@ -78,14 +98,11 @@ class MutationAmount(StoredColumn):
     def __init__(self, column: str):
         super().__init__(column)
 
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col(self.column)
 
-    def set_expression(self, amounts: pl.Expr) -> pl.Expr:
-        return pl.lit(amounts)
-
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
@@ -110,57 +127,53 @@ class DerivedMetric(BalanceSheetMetric, ABC):
 
 
 class Quantity(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col("Nominal") + pl.col("Notional")
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class DirtyPrice(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return (pl.col("Nominal") + pl.col("FairValueAdjustment") + pl.col("AccruedInterest")) / (
-            pl.col("Nominal") + pl.col("Notional") + pl.lit(SMALL_NUMBER)
-        )
+        return (MARKET_VALUE.get_expression / nonzero(QUANTITY.get_expression)).fill_null(0.0)
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
-        return (pl.col("Nominal") + pl.col("FairValueAdjustment") + pl.col("AccruedInterest")).sum() / (
-            pl.col("Nominal") + pl.col("Notional") + pl.lit(SMALL_NUMBER)
-        ).sum()
+        return (MARKET_VALUE.aggregation_expression / nonzero(QUANTITY.aggregation_expression)).fill_null(0.0)
 
 
 class MarketValue(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col("Nominal") + pl.col("FairValueAdjustment") + pl.col("AccruedInterest")
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class DerivedAmount(DerivedMetric):
-    def __init__(self, weight_column: str, allocation_expr: pl.Expr = pl.col("Nominal")):
+    def __init__(self, weight_column: str, allocation_expr: pl.Expr | None = None):
         self.weight_column = weight_column
-        self.allocation_expr = allocation_expr + pl.lit(SMALL_NUMBER)  # Prevent division by zero
+        self.allocation_expr = pl.col("Nominal") if allocation_expr is None else allocation_expr
 
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col(self.weight_column) * self.allocation_expr
 
     def set_expression(self, amounts: pl.Expr) -> pl.Expr:
         return amounts * self.allocation_expr
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
     def mutation_expression(self, amount: float, filter_expression: pl.Expr) -> pl.Expr:
-        return amount * self.allocation_expr / (filter_expression * self.allocation_expr).sum()
+        return allocate(amount, self.allocation_expr, filter_expression)
 
     @property
     def mutation_column(self) -> str:
@@ -168,20 +181,20 @@ class DerivedAmount(DerivedMetric):
 
 
 class DerivedWeight(DerivedMetric):
-    def __init__(self, amount_column: str, weight_expr: pl.Expr = pl.col("Nominal")):
+    def __init__(self, amount_column: str, weight_expr: pl.Expr | None = None):
         self.amount_column = amount_column
-        self.weight_expr = weight_expr + pl.lit(SMALL_NUMBER)  # Prevent division by zero
+        self.weight_expr = pl.col("Nominal") if weight_expr is None else weight_expr
 
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return pl.col(self.amount_column) / self.weight_expr
+        return (pl.col(self.amount_column) / nonzero(self.weight_expr)).fill_null(0.0)
 
     def set_expression(self, amounts: pl.Expr) -> pl.Expr:
         return amounts * self.weight_expr
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
-        return pl.col(self.amount_column).sum() / self.weight_expr.sum()
+        return (pl.col(self.amount_column).sum() / nonzero(self.weight_expr.sum())).fill_null(0.0)
 
     def mutation_expression(self, amount: float, filter_expression: pl.Expr) -> pl.Expr:
         return self.weight_expr * amount
@@ -192,42 +205,42 @@ class DerivedWeight(DerivedMetric):
 
 
 class OnBalanceExposure(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         # BookValue without (AC) impairments
         return pl.col("Nominal") + pl.col("Agio") + pl.col("AccruedInterest") + pl.col("FairValueAdjustment")
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class OffBalanceExposure(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col("CCF") * pl.col("Undrawn") + pl.col("OtherOffBalanceWeight") * pl.col("Nominal")
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class BaselExposure(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return OnBalanceExposure().get_expression + OffBalanceExposure().get_expression
+        return ON_BALANCE_EXPOSURE.get_expression + OFF_BALANCE_EXPOSURE.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class Limit(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return pl.col("Nominal") + pl.col("Undrawn")
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
@@ -240,17 +253,17 @@ class Limit(DerivedMetric):
 
 
 class LeverageExposure(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return OnBalanceExposure().get_expression + pl.col("Impairment") + OffBalanceExposure().get_expression
+        return ON_BALANCE_EXPOSURE.get_expression + pl.col("Impairment") + OFF_BALANCE_EXPOSURE.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class BookValue(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
         return (
             pl.col("Nominal")
@@ -260,36 +273,47 @@ class BookValue(DerivedMetric):
             + pl.col("FairValueAdjustment")
         )
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class HQLA(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return HQLARegistry.hqla_constribution_expression() * BookValue().get_expression
+        return HQLARegistry.hqla_constribution_expression() * BOOK_VALUE.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class EncumberedHQLA(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return pl.col("EncumberedWeight") * HQLA().get_expression
+        return pl.col("EncumberedWeight") * HQLA_AMOUNT.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
 
 
 class UnencumberedHQLA(DerivedMetric):
-    @property
+    @functools.cached_property
     def get_expression(self) -> pl.Expr:
-        return (1 - pl.col("EncumberedWeight")) * HQLA().get_expression
+        return (1 - pl.col("EncumberedWeight")) * HQLA_AMOUNT.get_expression
 
-    @property
+    @functools.cached_property
     def aggregation_expression(self) -> pl.Expr:
         return self.get_expression.sum()
+
+
+# Shared instances for metrics that are used as building blocks of other metrics, so that their (cached)
+# expressions are only built once
+QUANTITY = Quantity()
+MARKET_VALUE = MarketValue()
+ON_BALANCE_EXPOSURE = OnBalanceExposure()
+OFF_BALANCE_EXPOSURE = OffBalanceExposure()
+BASEL_EXPOSURE = BaselExposure()
+BOOK_VALUE = BookValue()
+HQLA_AMOUNT = HQLA()
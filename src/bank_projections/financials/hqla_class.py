@@ -1,3 +1,5 @@
+import functools
+
 import polars as pl
 
 from bank_projections.utils.base_registry import BaseRegistry
@@ -11,11 +13,17 @@ class HQLAClass:
 
 class HQLARegistry(BaseRegistry[HQLAClass]):
     @classmethod
+    def register(cls, name: str, item: HQLAClass) -> None:
+        super().register(name, item)
+        # The cached expression below depends on the registered classes
+        cls.hqla_constribution_expression.cache_clear()  # type: ignore[attr-defined]
+
+    @classmethod
+    @functools.cache
     def hqla_constribution_expression(cls) -> pl.Expr:
-        expr = pl.lit(0.0)  # Default, should not be used
-        for name, impl in cls.stripped_items.items():
-            expr = pl.when(pl.col("HQLAClass") == name).then(impl.contribution).otherwise(expr)
-        return expr
+        contributions = {name: impl.contribution for name, impl in cls.stripped_items.items()}
+        # Default should not be used
+        return pl.col("HQLAClass").replace_strict(contributions, default=0.0, return_dtype=pl.Float64)
 
 
 HQLARegistry.register("Level 1", HQLAClass(haircut=0.0))
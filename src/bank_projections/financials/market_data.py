@@ -1,23 +1,44 @@
+import functools
+
 import pandas as pd
 import polars as pl
 
 
 class Curves:
-    def __init__(self, data: pd.DataFrame | None = None):
-        self.data = pd.DataFrame() if data is None else data
+    def __init__(self, data: pl.DataFrame | pd.DataFrame | None = None):
+        if data is None:
+            data = pl.DataFrame()
+        elif isinstance(data, pd.DataFrame):
+            data = pl.from_pandas(data)
+        self.data = data
 
-    def get_spot_rates(self) -> dict[str, float]:
-        spot_rates = self.data.loc[self.data["Type"] == "spot"]
+    @functools.cached_property
+    def spot_rates_frame(self) -> pl.DataFrame:
+        return (
+            self.data.filter(pl.col("Type") == "spot")
+            .select(Key=pl.col("Name") + pl.col("Tenor"), Rate="Rate")
+            .unique(subset="Key", keep="last", maintain_order=True)
+        )
 
-        return dict(zip(spot_rates["Name"] + spot_rates["Tenor"], spot_rates["Rate"], strict=False))
+    def get_spot_rates(self) -> dict[str, float]:
+        return dict(self.spot_rates_frame.iter_rows())
 
-    def get_zero_rates(self) -> pd.DataFrame:
-        zero_rates = self.data.loc[self.data["Type"] == "zero", ["Name", "MaturityYears", "Rate"]]
+    def get_zero_rates(self) -> pl.DataFrame:
+        zero_rates = self.data.filter(pl.col("Type") == "zero").select("Name", "MaturityYears", "Rate")
 
         return zero_rates
 
     def floating_rate_expr(self) -> pl.Expr:
-        return pl.col("ReferenceRate").replace_strict(self.get_spot_rates(), default=pl.lit(None)).cast(pl.Float64)
+        return self._floating_rate_expr
+
+    @functools.cached_property
+    def _floating_rate_expr(self) -> pl.Expr:
+        # Built once per Curves instance (the data is never mutated); feed the columns directly,
+        # without building a Python dict of all spot rates
+        spot_rates = self.spot_rates_frame
+        return pl.col("ReferenceRate").replace_strict(
+            spot_rates["Key"], spot_rates["Rate"], default=pl.lit(None), return_dtype=pl.Float64
+        )
 
 
 TENOR_UNIT_MAP = {
@@ -37,3 +58,12 @@ def parse_tenor(tenor: str) -> float | None:
     if unit not in TENOR_UNIT_MAP:
         raise ValueError(f"Unknown tenor unit: {tenor}")
     return num * TENOR_UNIT_MAP[unit]
+
+
+def tenor_to_years(tenor: pl.Expr) -> pl.Expr:
+    # Vectorized version of parse_tenor; anything other than a number followed by a known unit results in null
+    tenor = tenor.str.strip_chars().str.to_lowercase()
+    pattern = r"^(\d+)\s*([a-z]+)$"
+    number = tenor.str.extract(pattern, 1).cast(pl.Int64)
+    unit = tenor.str.extract(pattern, 2)
+    return number * unit.replace_strict(TENOR_UNIT_MAP, default=None, return_dtype=pl.Float64)
@@ -1,3 +1,5 @@
+import functools
+
 import polars as pl
 
 from bank_projections.utils.base_registry import BaseRegistry
@@ -10,11 +12,18 @@ class IFRS9Stage:
 
 class IFRS9StageRegistry(BaseRegistry[IFRS9Stage]):
     @classmethod
+    def register(cls, name: str, item: IFRS9Stage) -> None:
+        super().register(name, item)
+        # The cached expression below depends on the registered stages
+        cls.is_default_expr.cache_clear()  # type: ignore[attr-defined]
+
+    @classmethod
+    @functools.cache
     def is_default_expr(cls) -> pl.Expr:
-        expr = pl.lit(False)
-        for name, stage_cls in cls.stripped_items.items():
-            expr = pl.when(pl.col("IFRS9Stage") == name).then(pl.lit(stage_cls.is_default)).otherwise(expr)
-        return expr
+        # The IFRS9Stage column is an Enum of the registered names (see Config.cast_columns), so is_in compares the
+        # integer codes rather than the strings
+        defaults = [name for name, stage in cls.stripped_items.items() if stage.is_default]
+        return pl.col("IFRS9Stage").is_in(defaults).fill_null(False)
 
 
 IFRS9StageRegistry.register("1", IFRS9Stage(is_default=False))
@@ -1,4 +1,5 @@
 import datetime
+import functools
 from abc import ABC, abstractmethod
 
 import polars as pl
@@ -6,26 +7,47 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem, BalanceSheetItemRegistry
 from bank_projections.financials.balance_sheet_metric_registry import BalanceSheetMetrics
+from bank_projections.financials.balance_sheet_metrics import BalanceSheetMetric
 from bank_projections.financials.stage import IFRS9StageRegistry
 from bank_projections.projections.coupon_payment import coupon_payment
 from bank_projections.projections.frequency import FrequencyRegistry
 from bank_projections.projections.redemption_type import RedemptionTypeRegistry
 from bank_projections.utils.base_registry import BaseRegistry
+from bank_projections.utils.date import add_months
 
 
 def calculate_metrics(bs: BalanceSheet) -> dict[str, float]:
+    # Evaluate all plain balance sheet aggregations in one go, instead of one filter and select per metric
     metrics: dict[str, float] = {}
-    for name, metric in MetricRegistry.items.items():
-        metrics[name] = metric.calculate(bs, metrics)
+    with bs.prefetch_amounts(MetricRegistry.aggregation_requests()):
+        for name, metric in MetricRegistry.items.items():
+            metrics[name] = metric.calculate(bs, metrics)
 
     return metrics
 
 
+def metrics_frame(metrics: dict[str, float]) -> pl.DataFrame:
+    # One row with a fixed Float64 schema, instead of inferring a Series per metric
+    return pl.DataFrame([tuple(metrics.values())], schema=dict.fromkeys(metrics, pl.Float64), orient="row")
+
+
 class Metric(ABC):
     @abstractmethod
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
         pass
 
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        # The plain balance sheet aggregations this metric is built from, which can be evaluated upfront
+        return []
+
+    def evaluate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
+        # Registered metrics are calculated in registration order, so a registered building block of a composite
+        # metric has already been calculated for this balance sheet and is reused instead of recalculated
+        name = MetricRegistry.names_by_id().get(id(self))
+        if name is not None and name in previous_metrics:
+            return previous_metrics[name]
+        return self.calculate(bs, previous_metrics)
+
     def __neg__(self) -> "Metric":
         return Multiplied(self, -1)
 
@@ -45,17 +67,23 @@ class Ratio(Metric):
         self.denominator = denominator
 
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        numerator = self.numerator.calculate(bs, previous_metrics)
-        denominator = self.denominator.calculate(bs, previous_metrics)
+        numerator = self.numerator.evaluate(bs, previous_metrics)
+        denominator = self.denominator.evaluate(bs, previous_metrics)
         return numerator / denominator if denominator != 0 else 0.0
 
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return self.numerator.aggregations() + self.denominator.aggregations()
+
 
 class Sum(Metric):
     def __init__(self, metrics: list[Metric]):
         self.metrics = metrics
 
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        return sum(metric.calculate(bs, previous_metrics) for metric in self.metrics)
+        return sum(metric.evaluate(bs, previous_metrics) for metric in self.metrics)
+
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return [aggregation for metric in self.metrics for aggregation in metric.aggregations()]
 
 
 class Clipped(Metric):
@@ -65,13 +93,16 @@ class Clipped(Metric):
         self.max_value = max_value
 
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        value = self.metric.calculate(bs, previous_metrics)
+        value = self.metric.evaluate(bs, previous_metrics)
         if self.min_value is not None:
             value = max(value, self.min_value)
         if self.max_value is not None:
             value = min(value, self.max_value)
         return value
 
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return self.metric.aggregations()
+
 
 class Multiplied(Metric):
     def __init__(self, metric: Metric, factor: float):
@@ -79,7 +110,10 @@ class Multiplied(Metric):
         self.factor = factor
 
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        return self.metric.calculate(bs, previous_metrics) * self.factor
+        return self.metric.evaluate(bs, previous_metrics) * self.factor
+
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return self.metric.aggregations()
 
 
 class BalanceSheetAggregation(Metric):
@@ -90,13 +124,19 @@ class BalanceSheetAggregation(Metric):
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
         return bs.get_amount(self.item, self.metric)
 
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return [self]
+
 
 class MRELEligibleLiabilities(Metric):
+    def __init__(self) -> None:
+        # Resolved once; only the maturity condition depends on the balance sheet date
+        self.item = BalanceSheetItem(ItemType="Borrowings")
+        self.metric = BalanceSheetMetrics.get("Book value")
+
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        item = BalanceSheetItem(
-            ItemType="Borrowings", expr=pl.col("MaturityDate") >= pl.lit(bs.date).dt.offset_by("1y")
-        )
-        return -bs.get_amount(item, BalanceSheetMetrics.get("Book value"))
+        item = self.item.add_condition(pl.col("MaturityDate") >= add_months(bs.date, 12))
+        return -bs.get_amount(item, self.metric)
 
 
 class ContractualInflowPrincipal(Metric):
@@ -118,7 +158,11 @@ class ContractualInflowPrincipal(Metric):
         )
 
         inflow = (
-            bs._data.filter(self.item.filter_expression).select((repayment_factors * pl.col("Nominal")).sum()).item()
+            bs._data.lazy()
+            .filter(self.item.filter_expression)
+            .select((repayment_factors * pl.col("Nominal")).sum())
+            .collect()
+            .item()
         )
 
         return float(inflow)
@@ -136,28 +180,31 @@ class ContractualInflowCoupon(Metric):
         )
         coupon_payments = coupon_payment(pl.col("Nominal"), pl.col("InterestRate")) * number_of_payments
 
-        inflow = bs._data.filter(self.item.filter_expression).select(coupon_payments.sum()).item()
+        inflow = bs._data.lazy().filter(self.item.filter_expression).select(coupon_payments.sum()).collect().item()
 
         return float(inflow)
 
 
 class UnencumberedHQLACapped(Metric):
-    def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
-        unencumbered_hqla = previous_metrics["UnencumberedHQLA"]
-
-        unencumbered_level1 = BalanceSheetAggregation(
+    def __init__(self) -> None:
+        self.level1 = BalanceSheetAggregation(
             "UnencumberedHQLA", BalanceSheetItemRegistry.get("Assets").add_identifier("HQLAClass", "level1")
-        ).calculate(bs, previous_metrics)
-
-        unencumbered_level2a = BalanceSheetAggregation(
+        )
+        self.level2a = BalanceSheetAggregation(
             "UnencumberedHQLA", BalanceSheetItemRegistry.get("Assets").add_identifier("HQLAClass", "level2a")
-        ).calculate(bs, previous_metrics)
-
-        unencumbered_level2b = BalanceSheetAggregation(
+        )
+        self.level2b = BalanceSheetAggregation(
             "UnencumberedHQLA",
             BalanceSheetItemRegistry.get("Assets").add_identifier("HQLAClass", "level2bcorporate")
             | BalanceSheetItemRegistry.get("Assets").add_identifier("HQLAClass", "level2bequity"),
-        ).calculate(bs, previous_metrics)
+        )
+
+    def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
+        unencumbered_hqla = previous_metrics["UnencumberedHQLA"]
+
+        unencumbered_level1 = self.level1.calculate(bs, previous_metrics)
+        unencumbered_level2a = self.level2a.calculate(bs, previous_metrics)
+        unencumbered_level2b = self.level2b.calculate(bs, previous_metrics)
 
         # Apply Basel III caps: Level 2a capped at 40% of total HQLA after caps
         # Level 2 (2a + 2b) capped at 15% of total HQLA after caps
@@ -169,6 +216,9 @@ class UnencumberedHQLACapped(Metric):
 
         return unencumbered_level1 + level2_total
 
+    def aggregations(self) -> list["BalanceSheetAggregation"]:
+        return [self.level1, self.level2a, self.level2b]
+
 
 class NetOutflow(Metric):
     def calculate(self, bs: BalanceSheet, previous_metrics: dict[str, float]) -> float:
@@ -176,7 +226,25 @@ class NetOutflow(Metric):
 
 
 class MetricRegistry(BaseRegistry[Metric]):
-    pass
+    @classmethod
+    def register(cls, name: str, item: Metric) -> None:
+        super().register(name, item)
+        cls.aggregation_requests.cache_clear()  # type: ignore[attr-defined]
+        cls.names_by_id.cache_clear()  # type: ignore[attr-defined]
+
+    @classmethod
+    @functools.cache
+    def names_by_id(cls) -> dict[int, str]:
+        # The registered name of each metric instance; the registry keeps the instances alive, so ids are stable
+        return {id(metric): name for name, metric in cls.items.items()}
+
+    @classmethod
+    @functools.cache
+    def aggregation_requests(cls) -> tuple[tuple[BalanceSheetItem, BalanceSheetMetric], ...]:
+        # The plain balance sheet aggregations of all metrics, which can be evaluated upfront
+        return tuple(
+            (aggregation.item, aggregation.metric) for metric in cls.values() for aggregation in metric.aggregations()
+        )
 
 
 MetricRegistry.register(
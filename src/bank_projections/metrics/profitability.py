@@ -1,5 +1,6 @@
 from typing import Any
 
+import numpy as np
 import polars as pl
 
 from bank_projections.app_config import Config
@@ -16,42 +17,58 @@ def calculate_profitability(
     if not is_end_of_month(current_date):
         return []
 
+    # Resolve the outlook windows first, so that only the steps since the earliest start are stacked and summed
+    windows = []
     for outlook in Config.profitability_outlooks:
         # Config.PROFITABILITY_OUTLOOKS() only contains monthly-based frequencies (Monthly, Quarterly, Annual)
         number_of_months = FrequencyRegistry.get(outlook).number_of_months  # type: ignore[attr-defined]
         horizon_start_date = add_months(current_date, -number_of_months, make_end_of_month=True)
-        find_index = [i for i, date in enumerate(horizon.dates) if date == horizon_start_date]
-        if len(find_index) == 0:
-            continue
-        start_index = find_index[0]
+        start_index = horizon.index_of(horizon_start_date)
+        if start_index is not None:
+            windows.append((outlook, number_of_months, horizon_start_date, start_index))
+    if not windows:
+        return []
+    min_start_index = min(start_index for *_, start_index in windows)
+
+    # Stack the metrics once as a (dates, metrics) matrix so that every outlook is a single weighted sum
+    metric_names = list(metric_list[min_start_index])
+    metric_matrix = np.array([[metrics[name] for name in metric_names] for metrics in metric_list[min_start_index:]])
+    days = np.diff([date.toordinal() for date in horizon.dates[min_start_index : len(metric_list)]])
+    # The (net income, net interest income) of each step since the earliest start, so that an outlook sums its steps
+    pnl_totals = np.array([net_incomes(pnls) for pnls in pnl_list[(min_start_index + 1) :]]).reshape(-1, 2)
+
+    for outlook, number_of_months, horizon_start_date, start_index in windows:
+        # Position of the outlook start within the stacked steps
+        offset = start_index - min_start_index
 
         # Calculate weighted average metrics
-        wa_metrics = {}
         total_days = (current_date - horizon_start_date).days
-        for metric in metric_list[0]:
-            wa_metrics[metric] = float(
-                sum(
-                    metric_list[i][metric] * (horizon.dates[i + 1] - horizon.dates[i]).days / total_days
-                    for i in range(start_index, len(metric_list) - 1)
-                )
-            )
-
-        pnls = pl.concat(pnl_list[(start_index + 1) :])
-        result = calculate_profitability_single_horizon(wa_metrics, pnls, number_of_months)
+        weighted_averages = days[offset:] @ metric_matrix[offset:-1] / total_days
+        wa_metrics = dict(zip(metric_names, weighted_averages.tolist(), strict=True))
+
+        net_income, net_interest_income = pnl_totals[offset:].sum(axis=0).tolist()
+        result = calculate_profitability_single_horizon(wa_metrics, net_income, net_interest_income, number_of_months)
         result_list.append({"outlook": outlook, **result})
     return result_list
 
 
+def net_incomes(pnls: pl.DataFrame) -> tuple[float, float]:
+    # Net income and net interest income in a single pass
+    net_income, net_interest_income = pnls.select(
+        pl.col("Amount").sum(),
+        pl.col("Amount").filter(pl.col("rule").is_in(["Accrual", "Coupons"])).sum().alias("NetInterestIncome"),
+    ).row(0)
+    return net_income, net_interest_income
+
+
 def calculate_profitability_single_horizon(
-    wa_metrics: dict[str, float], pnls: pl.DataFrame, number_of_months: int
+    wa_metrics: dict[str, float], net_income: float, net_interest_income: float, number_of_months: int
 ) -> dict[str, Any]:
     result = {
         "Total Assets": wa_metrics["Total Assets"],
         "Total Equity": wa_metrics["Total Equity"],
-        "Net Income": pnls["Amount"].sum(),
-        "Net Interest Income": pnls.filter(pl.col("rule").is_in(["Accrual", "Coupons"]))
-        .select(pl.col("Amount").sum())
-        .item(),
+        "Net Income": net_income,
+        "Net Interest Income": net_interest_income,
     }
 
     result["Return on Assets"] = annualize(result["Net Income"] / wa_metrics["Total Assets"], number_of_months)
@@ -3,6 +3,7 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet, MutationReason
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem
+from bank_projections.financials.balance_sheet_metrics import QUANTITY, allocate
 from bank_projections.projections.accrual_method import AccrualMethodRegistry
 from bank_projections.projections.projectionrule import ProjectionRule
 from bank_projections.scenarios.scenario import ScenarioSnapShot
@@ -15,20 +16,16 @@ class Accrual(ProjectionRule):
             return bs
 
         accrual = AccrualMethodRegistry.interest_accrual(
-            pl.col("Nominal") + pl.col("Notional"),
+            QUANTITY.get_expression,
             pl.col("InterestRate"),
             pl.col("PreviousCouponDate"),
             pl.col("NextCouponDate"),
             increment.to_date,
         )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "accrual"]:
+        for mutation in scenario.mutations_for("accrual"):
             accrual = (
                 pl.when(mutation.item.filter_expression)
-                .then(
-                    pl.lit(mutation.amount)
-                    / (pl.col("Nominal") * mutation.item.filter_expression).sum()
-                    * pl.col("Nominal")
-                )
+                .then(allocate(mutation.amount, pl.col("Nominal"), mutation.item.filter_expression))
                 .otherwise(accrual)
             )
 
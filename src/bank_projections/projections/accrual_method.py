@@ -1,4 +1,5 @@
 import datetime
+import functools
 from abc import ABC, abstractmethod
 
 import polars as pl
@@ -64,9 +65,7 @@ class RecalculateAccrual(AccrualMethod):
         next_coupon_date: pl.Expr,
         current_date: datetime.date,
     ) -> pl.Expr:
-        days_fraction = self.day_count.year_fraction(
-            previous_coupon_date, pl.lit(current_date)
-        ) / self.day_count.year_fraction(previous_coupon_date, next_coupon_date)
+        days_fraction = self.day_count.period_fraction(previous_coupon_date, pl.lit(current_date), next_coupon_date)
 
         new_calculated = days_fraction.fill_null(0) * nominal * coupon_rate * FrequencyRegistry.portion_year()
         matured = pl.col("MaturityDate") <= pl.lit(current_date)
@@ -154,6 +153,12 @@ class ManualAccrualType(AccrualMethod):
 
 
 class AccrualMethodRegistry(BaseRegistry[AccrualMethod]):
+    @classmethod
+    def register(cls, name: str, item: AccrualMethod) -> None:
+        super().register(name, item)
+        # The cached expression below depends on the registered accrual methods
+        cls.is_accumulating.cache_clear()  # type: ignore[attr-defined]
+
     @classmethod
     def interest_accrual(
         cls,
@@ -201,13 +206,12 @@ class AccrualMethodRegistry(BaseRegistry[AccrualMethod]):
         return expr
 
     @classmethod
+    @functools.cache
     def is_accumulating(cls) -> pl.Expr:
-        expr = pl.lit(False)
-        for name, accrual_method in cls.stripped_items.items():
-            expr = (
-                pl.when(pl.col("AccrualMethod") == name).then(pl.lit(accrual_method.is_accumulating())).otherwise(expr)
-            )
-        return expr
+        # A flag per method rather than an expression, so a membership test on the AccrualMethod Enum codes replaces
+        # the chain of string comparisons
+        accumulating = [name for name, accrual_method in cls.stripped_items.items() if accrual_method.is_accumulating()]
+        return pl.col("AccrualMethod").is_in(accumulating).fill_null(False)
 
 
 AccrualMethodRegistry.register("Recalculate Actual36525", RecalculateAccrual(Actual36525))
@@ -3,7 +3,7 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet, MutationReason
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem
-from bank_projections.financials.balance_sheet_metrics import SMALL_NUMBER
+from bank_projections.financials.balance_sheet_metrics import allocate
 from bank_projections.projections.projectionrule import ProjectionRule
 from bank_projections.scenarios.scenario import ScenarioSnapShot
 from bank_projections.utils.time import TimeIncrement
@@ -28,14 +28,10 @@ class AgioRedemption(ProjectionRule):
                 / (pl.col("MaturityDate") - increment.from_date).dt.total_days()
             )
         )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "agioredemption"]:
+        for mutation in scenario.mutations_for("agioredemption"):
             agio_redemption = (
                 pl.when(mutation.item.filter_expression)
-                .then(
-                    pl.lit(mutation.amount)
-                    / ((pl.col("Agio") * mutation.item.filter_expression).sum() + SMALL_NUMBER)
-                    * pl.col("Agio")
-                )
+                .then(allocate(mutation.amount, pl.col("Agio"), mutation.item.filter_expression))
                 .otherwise(agio_redemption)
             )
 
@@ -10,7 +10,7 @@ import xlsxwriter
 from loguru import logger
 
 from bank_projections.financials.balance_sheet import BalanceSheet
-from bank_projections.metrics.metrics import calculate_metrics
+from bank_projections.metrics.metrics import calculate_metrics, metrics_frame
 from bank_projections.metrics.profitability import calculate_profitability
 from bank_projections.output_config import AggregationConfig
 from bank_projections.projections.projectionrule import ProjectionRule
@@ -118,7 +118,7 @@ class Projection:
                         progress_callback(current_step, total_steps)
 
                 metrics_dict = calculate_metrics(bs)
-                metrics_df = pl.DataFrame(metrics_dict)
+                metrics_df = metrics_frame(metrics_dict)
 
                 agg_bs, pnls, cashflows, ocis = bs.aggregate(aggregation_config)
                 balance_sheets.append(agg_bs)
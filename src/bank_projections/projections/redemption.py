@@ -3,6 +3,7 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet, MutationReason
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem
+from bank_projections.financials.balance_sheet_metrics import nonzero
 from bank_projections.projections.projectionrule import ProjectionRule
 from bank_projections.projections.redemption_type import RedemptionTypeRegistry
 from bank_projections.scenarios.scenario import ScenarioSnapShot
@@ -26,24 +27,30 @@ class Redemption(ProjectionRule):
                 )
             )
         )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "repaymentrate"]:
+        for mutation in scenario.mutations_for("repaymentrate"):
             repayment_factors = (
                 pl.when(mutation.item.filter_expression).then(pl.lit(mutation.amount)).otherwise(repayment_factors)
             )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "repayment"]:
+        for mutation in scenario.mutations_for("repayment"):
             repayment_factors = (
                 pl.when(mutation.item.filter_expression)
-                .then(pl.lit(mutation.amount) / ((pl.col("Nominal") * mutation.item.filter_expression).sum()))
+                .then(
+                    (
+                        pl.lit(mutation.amount) / nonzero((pl.col("Nominal") * mutation.item.filter_expression).sum())
+                    ).fill_null(0.0)
+                )
                 .otherwise(repayment_factors)
             )
 
         prepayment_factors = pl.col("PrepaymentRate").fill_null(0.0) * increment.portion_year
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "prepayment"]:
+        for mutation in scenario.mutations_for("prepayment"):
             prepayment_factors = (
                 pl.when(mutation.item.filter_expression)
                 .then(
-                    pl.lit(mutation.amount)
-                    / (pl.col("Nominal") * (1 - repayment_factors) * mutation.item.filter_expression).sum()
+                    (
+                        pl.lit(mutation.amount)
+                        / nonzero((pl.col("Nominal") * (1 - repayment_factors) * mutation.item.filter_expression).sum())
+                    ).fill_null(0.0)
                 )
                 .otherwise(prepayment_factors)
             )
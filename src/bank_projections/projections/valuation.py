@@ -3,7 +3,7 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet, MutationReason
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem
-from bank_projections.financials.balance_sheet_metrics import SMALL_NUMBER, Quantity
+from bank_projections.financials.balance_sheet_metrics import QUANTITY, allocate
 from bank_projections.projections.projectionrule import ProjectionRule
 from bank_projections.projections.valuation_method import ValuationMethodRegistry
 from bank_projections.scenarios.scenario import ScenarioSnapShot
@@ -21,7 +21,7 @@ class Valuation(ProjectionRule):
             bs._data, increment.to_date, zero_rates, "NewDirtyPrice"
         )
         new_fair_value_adjustment = (
-            pl.col("NewDirtyPrice") * (pl.col("Nominal") + pl.col("Notional"))
+            pl.col("NewDirtyPrice") * QUANTITY.get_expression
             - pl.col("AccruedInterest")
             - pl.col("Nominal")
             - pl.col("Impairment")
@@ -29,14 +29,10 @@ class Valuation(ProjectionRule):
         signs = BalanceSheetCategoryRegistry.book_value_sign()
         fair_value_change = new_fair_value_adjustment - pl.col("FairValueAdjustment")
 
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "fairvaluechange"]:
+        for mutation in scenario.mutations_for("fairvaluechange"):
             fair_value_change = (
                 pl.when(mutation.item.filter_expression)
-                .then(
-                    pl.lit(mutation.amount)
-                    / ((Quantity().get_expression * mutation.item.filter_expression).sum() + SMALL_NUMBER)
-                    * Quantity().get_expression
-                )
+                .then(allocate(mutation.amount, QUANTITY.get_expression, mutation.item.filter_expression))
                 .otherwise(fair_value_change)
             )
 
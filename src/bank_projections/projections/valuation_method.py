@@ -1,7 +1,6 @@
 import datetime
 from abc import ABC, abstractmethod
 
-import pandas as pd
 import polars as pl
 
 from bank_projections.projections.frequency import FrequencyRegistry
@@ -19,7 +18,7 @@ class ValuationMethod(ABC):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         pass
@@ -29,7 +28,7 @@ class ValuationMethod(ABC):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         return cls.calculated_dirty_price(data, projection_date, zero_rates, output_column).with_columns(
@@ -56,7 +55,7 @@ class NoValuationMethod(ValuationMethod):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         return data.with_columns(pl.lit(None, dtype=pl.Float64).alias(output_column))
@@ -72,7 +71,7 @@ class AmortizedCostValuationMethod(ValuationMethod):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         return data.with_columns(
@@ -97,7 +96,7 @@ class FixedRateBondValuationMethod(ValuationMethod):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         if data.height == 0:
@@ -169,7 +168,7 @@ class FloatingRateBondValuationMethod(ValuationMethod):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         # include principal (par) for floating rate note
@@ -198,7 +197,7 @@ class SwapValuationMethod(ValuationMethod):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         # no principal payment => include_par = False
@@ -214,7 +213,7 @@ class SwapValuationMethod(ValuationMethod):
 
 def get_discount_rates(
     loans: pl.DataFrame,
-    zero_rates: pd.DataFrame,
+    zero_rates: pl.DataFrame,
     time_expr: pl.Expr,
 ) -> pl.Series:
     """
@@ -225,8 +224,7 @@ def get_discount_rates(
 
     # Convert and prepare zero curve once
     zero_pl = (
-        pl.from_pandas(zero_rates)
-        .select(
+        zero_rates.select(
             pl.col("Name").alias("zc_name").cast(pl.Utf8),
             pl.col("MaturityYears").alias("zc_t").cast(pl.Float64),
             pl.col("Rate").alias("zc_r").cast(pl.Float64),
@@ -299,7 +297,7 @@ def get_discount_rates(
 def _price_spread_instrument(
     data: pl.DataFrame,
     projection_date: datetime.date,
-    zero_rates: pd.DataFrame,
+    zero_rates: pl.DataFrame,
     output_column: str,
     rate_expr: pl.Expr,
     include_par: bool,
@@ -383,7 +381,7 @@ class ValuationMethodRegistry(BaseRegistry[ValuationMethod]):
         cls,
         data: pl.DataFrame,
         projection_date: datetime.date,
-        zero_rates: pd.DataFrame,
+        zero_rates: pl.DataFrame,
         output_column: str,
     ) -> pl.DataFrame:
         results = []
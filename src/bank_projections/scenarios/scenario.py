@@ -1,3 +1,4 @@
+import functools
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
@@ -29,6 +30,19 @@ class ScenarioSnapShot:
     mutations: list[BalanceSheetMutationInputItem]
     cost_income: list[CostIncomeInputItem]
 
+    @functools.cached_property
+    def _mutations_by_metric(self) -> dict[str, list[BalanceSheetMutationInputItem]]:
+        mutations_by_metric: dict[str, list[BalanceSheetMutationInputItem]] = defaultdict(list)
+        for mutation in self.mutations:
+            # Mutations of a balance sheet metric are applied by the mutation rule, not by a projection rule
+            if isinstance(mutation.metric, str):
+                mutations_by_metric[mutation.metric].append(mutation)
+        return mutations_by_metric
+
+    def mutations_for(self, metric: str) -> list[BalanceSheetMutationInputItem]:
+        # The mutations are grouped once per snapshot, as every projection rule asks for its own metrics
+        return self._mutations_by_metric.get(metric, [])
+
 
 class Scenario:
     def __init__(self, excel_inputs: list[ExcelInput]) -> None:
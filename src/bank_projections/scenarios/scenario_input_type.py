@@ -4,13 +4,14 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
+import polars as pl
 
 from bank_projections.app_config import Config
 from bank_projections.financials.balance_sheet import MutationReason
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem, BalanceSheetItemRegistry, Cohort
 from bank_projections.financials.balance_sheet_metric_registry import BalanceSheetMetrics
 from bank_projections.financials.balance_sheet_metrics import BalanceSheetMetric  # noqa: TC001
-from bank_projections.financials.market_data import Curves, parse_tenor
+from bank_projections.financials.market_data import Curves, tenor_to_years
 from bank_projections.scenarios.excel_sheet_format import ExcelInput, KeyValueInput
 from bank_projections.utils.parsing import (
     get_identifier,
@@ -75,50 +76,71 @@ class AuditInput(ScenarioInput):
 
 
 class CurveInput(ScenarioInput):
+    SCHEMA = {
+        "Date": pl.Date,
+        "Name": pl.String,
+        "Type": pl.Categorical,
+        "Tenor": pl.String,
+        "Maturity": pl.String,
+        "Rate": pl.Float64,
+        "MaturityYears": pl.Float64,
+    }
+
     def __init__(self, excel_inputs: list[ExcelInput]) -> None:
-        self.data = pd.concat([excel_input.to_dataframe() for excel_input in excel_inputs], ignore_index=True)
+        self.data = pl.concat(
+            [self._from_pandas(excel_input.to_dataframe()) for excel_input in excel_inputs], how="diagonal_relaxed"
+        )
         self._enforce_schema()
 
-    @staticmethod
-    def _empty_frame() -> pd.DataFrame:
-        return pd.DataFrame(
-            {
-                "Date": pd.Series(dtype="datetime64[ns]"),
-                "Name": pd.Series(dtype="string"),
-                "Type": pd.Series(dtype="string"),
-                "Tenor": pd.Series(dtype="string"),
-                "Maturity": pd.Series(dtype="string"),
-                "Rate": pd.Series(dtype="float64"),
-                "MaturityYears": pd.Series(dtype="float64"),
-            }
-        )
+    @classmethod
+    def _from_pandas(cls, df: pd.DataFrame) -> pl.DataFrame:
+        # Excel columns can mix types (e.g. "3m" and 6), which Arrow cannot convert; coerce those on the pandas side
+        coercions = {}
+        for col in df.columns:
+            if not pd.api.types.is_object_dtype(df[col]):
+                continue
+            if cls.SCHEMA.get(col) == pl.Float64:
+                coercions[col] = pd.to_numeric(df[col], errors="coerce")
+            elif cls.SCHEMA.get(col) == pl.Date:
+                coercions[col] = pd.to_datetime(df[col], errors="coerce")
+            else:
+                coercions[col] = df[col].astype("string")
+        return pl.from_pandas(df.assign(**coercions))
 
     def _enforce_schema(self) -> None:
         # Ensure all required columns exist
-        template = self._empty_frame()
-        for col in template.columns:
-            if col not in self.data.columns:
-                self.data[col] = template[col]
-
-        # Coerce types
-        self.data["Date"] = pd.to_datetime(self.data["Date"], errors="coerce")
-
-        for col in ["Name", "Type", "Tenor", "Maturity"]:
-            self.data[col] = self.data[col].astype("string").str.strip().str.lower()
+        self.data = self.data.with_columns(
+            pl.lit(None, dtype=dtype).alias(col) for col, dtype in self.SCHEMA.items() if col not in self.data.columns
+        )
 
-        self.data["Rate"] = pd.to_numeric(self.data["Rate"], errors="coerce").astype("float64")
+        # Coerce types; columns that already have the right type are not parsed again
+        schema = self.data.schema
+        coercions = {
+            col: pl.col(col).cast(pl.String).str.strip_chars().str.to_lowercase()
+            for col in ["Name", "Type", "Tenor", "Maturity"]
+        }
+        if schema["Date"] == pl.String:
+            coercions["Date"] = pl.col("Date").str.to_date(strict=False)
+        elif schema["Date"] != pl.Date:
+            coercions["Date"] = pl.col("Date").cast(pl.Date)
+        if schema["Rate"] != pl.Float64:
+            coercions["Rate"] = pl.col("Rate").cast(pl.Float64, strict=False)
+        self.data = self.data.with_columns(**coercions)
 
         # (Re)compute MaturityYears from Maturity ensuring float dtype
-        self.data["MaturityYears"] = self.data["Maturity"].map(parse_tenor).astype("float64")
+        self.data = self.data.with_columns(MaturityYears=tenor_to_years(pl.col("Maturity")))
+        invalid_tenors = self.data.filter(pl.col("Maturity").is_not_null() & pl.col("MaturityYears").is_null())
+        if invalid_tenors.height > 0:
+            raise ValueError(f"Invalid tenor: {invalid_tenors['Maturity'].to_list()}")
 
-        # Column order normalization (optional but keeps consistency)
-        self.data = self.data[template.columns]
+        # Column order normalization; this also makes Type categorical, as it is only compared against literals
+        self.data = self.data.select(pl.col(col).cast(dtype) for col, dtype in self.SCHEMA.items())
 
     def filter_on_date_snapshot(self, increment: TimeIncrement) -> Curves:
-        latest_date = self.data[self.data["Date"] <= pd.Timestamp(increment.to_date)]["Date"].max()
-        if pd.isna(latest_date):
+        latest_date = self.data.filter(pl.col("Date") <= increment.to_date)["Date"].max()
+        if latest_date is None:
             raise ValueError(f"No curve data available for date {increment.to_date}")
-        filtered_data = self.data.loc[self.data["Date"] == latest_date]
+        filtered_data = self.data.filter(pl.col("Date") == latest_date)
 
         # TODO: Interpolation between dates
 
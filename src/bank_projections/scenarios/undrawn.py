@@ -3,6 +3,7 @@ import polars as pl
 from bank_projections.financials.balance_sheet import BalanceSheet, MutationReason
 from bank_projections.financials.balance_sheet_category import BalanceSheetCategoryRegistry
 from bank_projections.financials.balance_sheet_item import BalanceSheetItem
+from bank_projections.financials.balance_sheet_metrics import allocate
 from bank_projections.projections.projectionrule import ProjectionRule
 from bank_projections.scenarios.scenario import ScenarioSnapShot
 from bank_projections.utils.time import TimeIncrement
@@ -14,17 +15,13 @@ class DrawDownRule(ProjectionRule):
             return bs
 
         draw_downs = pl.col("CCF").fill_null(0.0) * increment.portion_year * pl.col("Undrawn")
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "drawdown"]:
+        for mutation in scenario.mutations_for("drawdown"):
             draw_downs = (
                 pl.when(mutation.item.filter_expression)
-                .then(
-                    pl.lit(mutation.amount)
-                    / (pl.col("Nominal") * mutation.item.filter_expression).sum()
-                    * pl.col("Nominal")
-                )
+                .then(allocate(mutation.amount, pl.col("Nominal"), mutation.item.filter_expression))
                 .otherwise(draw_downs)
             )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "drawdownrate"]:
+        for mutation in scenario.mutations_for("drawdownrate"):
             draw_downs = (
                 pl.when(mutation.item.filter_expression)
                 .then(pl.col("Undrawn") * pl.lit(mutation.amount))
@@ -32,17 +29,13 @@ class DrawDownRule(ProjectionRule):
             )
 
         top_ups = pl.lit(0.0)
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "topup"]:
+        for mutation in scenario.mutations_for("topup"):
             top_ups = (
                 pl.when(mutation.item.filter_expression)
-                .then(
-                    pl.col("Nominal")
-                    * pl.lit(mutation.amount)
-                    / (pl.col("Nominal") * mutation.item.filter_expression).sum()
-                )
+                .then(allocate(mutation.amount, pl.col("Nominal"), mutation.item.filter_expression))
                 .otherwise(top_ups)
             )
-        for mutation in [mutation for mutation in scenario.mutations if mutation.metric == "topuprate"]:
+        for mutation in scenario.mutations_for("topuprate"):
             top_ups = (
                 pl.when(mutation.item.filter_expression)
                 .then(pl.col("Nominal") * pl.lit(mutation.amount))
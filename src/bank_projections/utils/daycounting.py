@@ -31,44 +31,67 @@ class DaycountFraction(ABC):
         """
         pass
 
+    @classmethod
+    def period_fraction(cls, start_date: pl.Expr, current_date: pl.Expr, end_date: pl.Expr) -> pl.Expr:
+        """Calculate the fraction of the period from start_date to end_date that has passed at current_date.
 
-class Actual360(DaycountFraction):
-    """Actual/360 daycount convention.
+        Args:
+            start_date: Polars expression representing the start of the period.
+            current_date: Polars expression representing the date within the period.
+            end_date: Polars expression representing the end of the period.
 
-    Calculates year fraction as: actual days / 360.
-    Commonly used for money market instruments.
+        Returns:
+            Polars expression representing the passed fraction of the period.
+        """
+        return cls.year_fraction(start_date, current_date) / cls.year_fraction(start_date, end_date)
+
+
+class ActualFixed(DaycountFraction):
+    """Base class for actual day conventions with a fixed number of days per year.
+
+    The fixed year length cancels out of period fractions, which are therefore plain day ratios.
     """
 
+    days_in_year: float = 0.0  # Needs to be overridden
+
     @classmethod
     def year_fraction(cls, start_date: pl.Expr, end_date: pl.Expr) -> pl.Expr:
         actual_days = (end_date - start_date).dt.total_days()
-        return actual_days / 360.0
+        return actual_days / cls.days_in_year
+
+    @classmethod
+    def period_fraction(cls, start_date: pl.Expr, current_date: pl.Expr, end_date: pl.Expr) -> pl.Expr:
+        return (current_date - start_date).dt.total_days() / (end_date - start_date).dt.total_days()
 
 
-class Actual365Fixed(DaycountFraction):
+class Actual360(ActualFixed):
+    """Actual/360 daycount convention.
+
+    Calculates year fraction as: actual days / 360.
+    Commonly used for money market instruments.
+    """
+
+    days_in_year = 360.0
+
+
+class Actual365Fixed(ActualFixed):
     """Actual/365 Fixed daycount convention.
 
     Calculates year fraction as: actual days / 365.
     Used for many government bonds and some corporate bonds.
     """
 
-    @classmethod
-    def year_fraction(cls, start_date: pl.Expr, end_date: pl.Expr) -> pl.Expr:
-        actual_days = (end_date - start_date).dt.total_days()
-        return actual_days / 365.0
+    days_in_year = 365.0
 
 
-class Actual36525(DaycountFraction):
+class Actual36525(ActualFixed):
     """Actual/365.25 daycount convention.
 
     Calculates year fraction as: actual days / 365.25.
     Accounts for leap years on average.
     """
 
-    @classmethod
-    def year_fraction(cls, start_date: pl.Expr, end_date: pl.Expr) -> pl.Expr:
-        actual_days = (end_date - start_date).dt.total_days()
-        return actual_days / 365.25
+    days_in_year = 365.25
 
 
 class ActualActualISDA(DaycountFraction):
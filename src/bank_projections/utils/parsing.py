@@ -1,4 +1,5 @@
 import datetime
+import functools
 from collections.abc import Iterable
 from typing import Any
 
@@ -13,6 +14,20 @@ def read_date(value: str | datetime.date | datetime.datetime) -> datetime.date:
     raise ValueError(f"Cannot convert {value} to date")
 
 
+def is_missing(value: Any) -> bool:
+    """Check for None, empty strings and NaN-like scalars (NaN, NaT, pd.NA) without importing pandas."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value == ""
+    try:
+        # NaN and NaT are the only scalars that are not equal to themselves
+        return bool(value != value)
+    except TypeError:
+        # pd.NA refuses to be converted to a bool
+        return True
+
+
 def read_bool(value: str | bool) -> bool:
     if isinstance(value, bool):
         return value
@@ -33,12 +48,20 @@ def read_int(value: str | int) -> int:
     raise ValueError(f"Cannot convert {value} to int")
 
 
-def get_identifier(input_identifier: str, reference_identifiers: Iterable[str]) -> str:
-    cleaned = strip_identifier(input_identifier)
+@functools.lru_cache(maxsize=256)
+def identifier_lookup(reference_identifiers: tuple[str, ...]) -> dict[str | None, str]:
+    # Maps each stripped identifier to the first reference identifier it came from
+    lookup: dict[str | None, str] = {}
     for id in reference_identifiers:
-        if cleaned == strip_identifier(id):
-            return id
-    raise KeyError(f"{input_identifier} not found in identifiers")
+        lookup.setdefault(strip_identifier(id), id)
+    return lookup
+
+
+def get_identifier(input_identifier: str, reference_identifiers: Iterable[str]) -> str:
+    try:
+        return identifier_lookup(tuple(reference_identifiers))[strip_identifier(input_identifier)]
+    except KeyError:
+        raise KeyError(f"{input_identifier} not found in identifiers") from None
 
 
 def get_identifiers(input_identifiers: Iterable[str], reference_identifiers: list[str]) -> list[str]:
@@ -50,7 +73,7 @@ def correct_identifier_keys(input_dict: dict[str, Any], reference_identifiers: l
 
 
 def is_in_identifiers(identifier: str, identifiers: Iterable[str]) -> bool:
-    return strip_identifier(identifier) in [strip_identifier(id2) for id2 in identifiers]
+    return strip_identifier(identifier) in identifier_lookup(tuple(identifiers))
 
 
 def strip_identifier_keys(input_dict: dict[str, Any]) -> dict[str, Any]:
@@ -62,16 +85,13 @@ def strip_identifier_keys(input_dict: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
+# Characters that are ignored when comparing identifiers, removed in one pass by str.translate
+IDENTIFIER_SEPARATORS = str.maketrans("", "", "_ -/\\")
+
+
+@functools.lru_cache(maxsize=4096)
 def strip_identifier(identifier: str | None) -> str | None:
     if identifier is None:
         return None
     else:
-        return (
-            identifier.strip()
-            .lower()
-            .replace("_", "")
-            .replace(" ", "")
-            .replace("-", "")
-            .replace("/", "")
-            .replace("\\", "")
-        )
+        return identifier.strip().lower().translate(IDENTIFIER_SEPARATORS)
@@ -1,5 +1,6 @@
 import calendar
 import datetime
+import functools
 from collections.abc import Iterator
 
 from dateutil.relativedelta import relativedelta
@@ -31,6 +32,14 @@ class TimeHorizon:
     def __len__(self) -> int:
         return len(self.dates)
 
+    @functools.cached_property
+    def _indices(self) -> dict[datetime.date, int]:
+        return {date: i for i, date in enumerate(self.dates)}
+
+    def index_of(self, date: datetime.date) -> int | None:
+        # Position of the date in the horizon, or None if it is not a horizon date
+        return self._indices.get(date)
+
     @classmethod
     def from_config(cls, cfg: TimeHorizonConfig) -> "TimeHorizon":
         start_date = cfg.start_date
@@ -292,6 +292,16 @@ class TestConfigCompatibility:
         assert isinstance(classifications, dict)
         assert "Book" in classifications
 
+    def test_config_identifier_index(self) -> None:
+        """Test Config.identifier_index() maps stripped names to their kind and canonical column."""
+        index = Config.identifier_index()
+
+        assert index["itemtype"] == ("label", "ItemType")
+        assert index["maturitydate"] == ("date", "MaturityDate")
+        assert index["book"] == ("classification", "Book")
+        # Should be cached
+        assert Config.identifier_index() is index
+
     def test_config_label_columns(self) -> None:
         """Test Config.label_columns() method."""
         label_cols = Config.label_columns()
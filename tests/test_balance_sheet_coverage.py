@@ -27,6 +27,19 @@ class TestBalanceSheetCoverage:
         with pytest.raises(ValueError):
             bs.mutate_metric(item, metric, 1000.0, reason)
 
+    def test_validate_classification_without_enum_dtype(self, minimal_scenario):
+        """Test that invalid classifications are still caught when the column is no longer an Enum."""
+        bs = create_synthetic_balance_sheet(datetime.date(2024, 12, 31), scenario=minimal_scenario)
+        bs._data = bs._data.with_columns(
+            pl.when(pl.col("ItemType") == "Cash")
+            .then(pl.lit("invalid"))
+            .otherwise(pl.col("HQLAClass").cast(pl.String))
+            .alias("HQLAClass")
+        )
+
+        with pytest.raises(ValueError, match="invalid values in column 'HQLAClass'"):
+            bs.validate()
+
     def test_copy_method(self, minimal_scenario):
         """Test the copy method returns a proper copy."""
         bs = create_synthetic_balance_sheet(datetime.date(2024, 12, 31), scenario=minimal_scenario)
@@ -108,6 +121,20 @@ class TestBalanceSheetCoverage:
         total_changes = sum([abs(diff_df[col].sum()) for col in delta_columns])
         assert total_changes > 0
 
+    def test_get_differences_leaves_inputs_and_dtypes(self, minimal_scenario):
+        """Test that get_differences does not modify its inputs and keeps each column's dtype."""
+        bs1 = create_synthetic_balance_sheet(datetime.date(2024, 12, 31), scenario=minimal_scenario)
+        bs2 = bs1.copy()
+        data1, data2 = bs1._data, bs2._data
+
+        diff_df = BalanceSheet.get_differences(bs1, bs2)
+
+        assert bs1._data is data1
+        assert bs2._data is data2
+        for column, dtype in data1.schema.items():
+            if dtype.is_numeric():
+                assert diff_df.schema[f"Delta_{column}"] == dtype
+
     def test_debug_method(self, minimal_scenario):
         """Test the debug class method."""
         bs1 = create_synthetic_balance_sheet(datetime.date(2024, 12, 31), scenario=minimal_scenario)
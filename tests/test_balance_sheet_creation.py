@@ -47,5 +47,17 @@ def test_balance_sheet_components(minimal_scenario):
     bs.validate()
 
 
+def test_initialize_new_date_skips_validation(minimal_scenario):
+    """Test that rolling to a new date does not re-validate, while an explicit validate still does."""
+    bs = create_synthetic_balance_sheet(current_date=datetime.date(2024, 12, 31), scenario=minimal_scenario)
+    bs.mutate_metric(BalanceSheetItem(SubItemType="Mortgages"), "Nominal", 1000.0, relative=True)
+
+    new_bs = bs.initialize_new_date(datetime.date(2025, 1, 31))
+
+    assert new_bs.date == datetime.date(2025, 1, 31)
+    with pytest.raises(ValueError, match="does not balance"):
+        new_bs.validate()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,8 +1,11 @@
 """Tests for BalanceSheetItem class to improve coverage."""
 
+import datetime
+
+import polars as pl
 import pytest
 
-from bank_projections.financials.balance_sheet_item import BalanceSheetItem
+from bank_projections.financials.balance_sheet_item import BalanceSheetItem, Cohort
 
 
 class TestBalanceSheetItem:
@@ -13,6 +16,12 @@ class TestBalanceSheetItem:
         with pytest.raises(ValueError, match="Invalid identifier 'invalid_key'"):
             BalanceSheetItem(invalid_key="value")
 
+    @pytest.mark.parametrize("value", ["", None, float("nan")])
+    def test_missing_identifier_value(self, value):
+        """Test that empty or missing identifier values raise ValueError."""
+        with pytest.raises(ValueError, match="BalanceSheetItem ItemType cannot be"):
+            BalanceSheetItem(ItemType=value)
+
     def test_add_identifier_invalid_key(self):
         """Test that add_identifier raises ValueError for invalid keys."""
         item = BalanceSheetItem()
@@ -27,6 +36,13 @@ class TestBalanceSheetItem:
         assert new_item.identifiers["ItemType"] == "Mortgages"
         assert item.identifiers == {}  # Original unchanged
 
+    def test_identifier_values_are_interned(self):
+        """Test that equal string identifier values share a single object across items."""
+        item1 = BalanceSheetItem(ItemType="".join(["Mort", "gages"]))
+        item2 = BalanceSheetItem(item_type="".join(["Mortg", "ages"]))
+
+        assert item1.identifiers["ItemType"] is item2.identifiers["ItemType"]
+
     def test_remove_identifier(self):
         """Test remove_identifier functionality."""
         item = BalanceSheetItem(ItemType="Mortgages", BalanceSheetCategory="assets")
@@ -48,6 +64,23 @@ class TestBalanceSheetItem:
         copied_item.add_identifier("BalanceSheetCategory", "Liabilities")
         assert item.identifiers["BalanceSheetCategory"] == "assets"
 
+    def test_add_condition_keeps_identifiers(self):
+        """Test that add_condition keeps the identifiers without sharing the dict with the original."""
+        item = BalanceSheetItem(ItemType="Mortgages")
+        new_item = item.add_condition(pl.col("Quantity") > 0)
+
+        assert new_item.identifiers == {"ItemType": "Mortgages"}
+        assert new_item.identifiers is not item.identifiers
+        assert item.expr is None
+
+    def test_and_combines_identifiers(self):
+        """Test that & merges identifiers and rejects conflicting values."""
+        item = BalanceSheetItem(ItemType="Mortgages") & BalanceSheetItem(ItemType="Mortgages", SubItemType="Fixed")
+
+        assert item.identifiers == {"ItemType": "Mortgages", "SubItemType": "Fixed"}
+        with pytest.raises(ValueError, match="Conflicting identifiers for BalanceSheetItem: ItemType"):
+            item & BalanceSheetItem(ItemType="Loans")
+
     def test_calculation_tag_identifier(self):
         """Test that calculation tag identifiers are properly cleaned."""
         # This should test the CALCULATION_TAGS branch
@@ -55,3 +88,27 @@ class TestBalanceSheetItem:
         # Add test for calculation tags if they exist in config
         assert item.identifiers["ItemType"] == "Mortgages"
         assert "AccountingMethod" in item.identifiers
+
+
+class TestCohort:
+    """Test Cohort expressions."""
+
+    def test_day_cohort_expression(self):
+        """Test that a day-based cohort selects origination dates within the age window."""
+        df = pl.DataFrame(
+            {"OriginationDate": [datetime.date(2024, 12, 30), datetime.date(2024, 12, 29), datetime.date(2024, 12, 28)]}
+        )
+        cohort = Cohort.from_string("agedays", 2)
+
+        result = df.filter(cohort.get_expression(datetime.date(2024, 12, 31)))
+
+        assert result["OriginationDate"].to_list() == [datetime.date(2024, 12, 29)]
+
+    def test_month_cohort_expression(self):
+        """Test that a minimum month-based cohort uses calendar months."""
+        df = pl.DataFrame({"OriginationDate": [datetime.date(2024, 1, 28), datetime.date(2024, 1, 29)]})
+        cohort = Cohort.from_string("minagemonths", 1)
+
+        result = df.filter(cohort.get_expression(datetime.date(2024, 2, 29)))
+
+        assert result["OriginationDate"].to_list() == [datetime.date(2024, 1, 29)]
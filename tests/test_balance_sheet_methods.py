@@ -41,6 +41,24 @@ class TestBalanceSheetMethods:
         # Both should be close to zero for balanced sheet, but may differ due to valuation adjustments
         assert abs(total_book_value) < 0.01, f"Total book value should be ~0, got {total_book_value}"
 
+    def test_get_amounts_matches_get_amount(self, bs) -> None:
+        """Test that the fused get_amounts and prefetch_amounts match individual get_amount calls."""
+        assets = BalanceSheetItem(BalanceSheetCategory="assets")
+        requests = [
+            (assets, BalanceSheetMetrics.get("book_value")),
+            (BalanceSheetItem(SubItemType="Mortgages"), BalanceSheetMetrics.get("nominal")),
+            (BalanceSheetItem(), BalanceSheetMetrics.get("interest_rate")),
+            (assets, BalanceSheetMetrics.get("hqla")),
+            (assets, BalanceSheetMetrics.get("book_value")),
+            (BalanceSheetItem(BalanceSheetCategory="assets"), BalanceSheetMetrics.get("nominal")),
+        ]
+        expected = [bs.get_amount(item, metric) for item, metric in requests]
+
+        assert bs.get_amounts(requests) == pytest.approx(expected)
+        with bs.prefetch_amounts(requests):
+            assert [bs.get_amount(item, metric) for item, metric in requests] == pytest.approx(expected)
+        assert bs._prefetched_amounts == {}
+
     def test_mutate_nominal_absolute(self, bs) -> None:
         """Test mutating nominal with absolute amounts."""
         # Get initial loan nominal
@@ -316,6 +334,17 @@ class TestBalanceSheetMethods:
         # Note: Balance sheet will be unbalanced after mutation without offset
         # This is expected behavior for this test
 
+    def test_mutation_reason_aggregate(self) -> None:
+        """Test that reason labels are attached after grouping on the data labels."""
+        data = pl.DataFrame({"ItemType": ["Loans", "Loans", "Deposits"], "Value": [1.0, 2.0, 3.0]})
+        reason = MutationReason(module="Test", rule="Aggregate", action="ignored")
+
+        result = reason.aggregate(data, pl.col("Value"), ["ItemType", "module", "rule"]).sort("ItemType")
+
+        assert result.columns == ["ItemType", "module", "rule", "Amount"]
+        assert result["Amount"].to_list() == [3.0, 3.0]
+        assert result["rule"].to_list() == ["Aggregate", "Aggregate"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+"""Unit tests for daycounting module."""
+
+import datetime
+
+import polars as pl
+import pytest
+
+from bank_projections.utils.daycounting import Actual360, Actual365Fixed, Actual36525, Thirty360BondBasis
+
+
+class TestPeriodFraction:
+    """Test the passed fraction of a period under different daycount conventions."""
+
+    @pytest.fixture
+    def df(self) -> pl.DataFrame:
+        return pl.DataFrame(
+            {
+                "start": [datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)],
+                "current": [datetime.date(2024, 2, 1), datetime.date(2024, 3, 15)],
+                "end": [datetime.date(2024, 4, 1), datetime.date(2024, 4, 30)],
+            }
+        )
+
+    @pytest.mark.parametrize("day_count", [Actual360, Actual365Fixed, Actual36525])
+    def test_actual_fixed_is_day_ratio(self, df: pl.DataFrame, day_count) -> None:
+        """Test that the fixed year length cancels out for actual day conventions."""
+        result = df.select(day_count.period_fraction(pl.col("start"), pl.col("current"), pl.col("end")))
+        assert result.to_series().to_list() == pytest.approx([31 / 91, 44 / 90])
+
+    def test_matches_ratio_of_year_fractions(self, df: pl.DataFrame) -> None:
+        """Test that other conventions divide the year fractions."""
+        expected = df.select(
+            Thirty360BondBasis.year_fraction(pl.col("start"), pl.col("current"))
+            / Thirty360BondBasis.year_fraction(pl.col("start"), pl.col("end"))
+        )
+        result = df.select(Thirty360BondBasis.period_fraction(pl.col("start"), pl.col("current"), pl.col("end")))
+        assert result.to_series().to_list() == pytest.approx(expected.to_series().to_list())
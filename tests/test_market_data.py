@@ -1,9 +1,10 @@
 """Tests for market data module."""
 
 import pandas as pd
+import polars as pl
 import pytest
 
-from bank_projections.financials.market_data import Curves, parse_tenor
+from bank_projections.financials.market_data import Curves, parse_tenor, tenor_to_years
 
 
 class TestCurves:
@@ -49,7 +50,7 @@ class TestCurves:
         curves = Curves(df)
         zero_rates = curves.get_zero_rates()
 
-        assert isinstance(zero_rates, pd.DataFrame)
+        assert isinstance(zero_rates, pl.DataFrame)
         assert "Name" in zero_rates.columns
         assert "MaturityYears" in zero_rates.columns
         assert "Rate" in zero_rates.columns
@@ -65,6 +66,25 @@ class TestCurves:
         # This should return a polars expression
         assert expr is not None
 
+    def test_floating_rate_expr_values(self):
+        """Test that the floating rate expression maps reference rates to spot rates."""
+        df = pd.DataFrame(
+            {"Name": ["euribor", "euribor"], "Type": ["spot", "zero"], "Tenor": ["3m", "1y"], "Rate": [0.03, 0.035]}
+        )
+        curves = Curves(df)
+        positions = pl.DataFrame({"ReferenceRate": ["euribor3m", "euribor1y", None]})
+
+        result = positions.select(curves.floating_rate_expr()).to_series().to_list()
+
+        assert result == [0.03, None, None]
+
+    def test_floating_rate_expr_is_cached(self):
+        """Test that repeated calls reuse the same expression."""
+        df = pd.DataFrame({"Name": ["euribor"], "Type": ["spot"], "Tenor": ["3m"], "Rate": [0.03]})
+        curves = Curves(df)
+
+        assert curves.floating_rate_expr() is curves.floating_rate_expr()
+
 
 class TestParseTenor:
     """Test parse_tenor function."""
@@ -102,3 +122,28 @@ class TestParseTenor:
         """Test that parsing is case insensitive."""
         assert parse_tenor("1M") == pytest.approx(1 / 12, rel=1e-6)
         assert parse_tenor("1Y") == pytest.approx(1.0, rel=1e-6)
+
+
+class TestTenorToYears:
+    """Test the vectorized tenor_to_years expression."""
+
+    def test_tenor_to_years_matches_parse_tenor(self):
+        """Test that the expression gives the same results as parse_tenor."""
+        tenors = ["1d", "2W", " 3m ", "10y", None]
+        result = pl.DataFrame({"Tenor": tenors}).select(tenor_to_years(pl.col("Tenor"))).to_series().to_list()
+
+        assert result[:-1] == pytest.approx([parse_tenor(tenor) for tenor in tenors[:-1]])
+        assert result[-1] is None
+
+    def test_tenor_to_years_unknown_unit(self):
+        """Test that unknown units result in null."""
+        result = pl.DataFrame({"Tenor": ["1x"]}).select(tenor_to_years(pl.col("Tenor"))).item()
+
+        assert result is None
+
+    @pytest.mark.parametrize("tenor", ["1y6m", "y1", "1.5y", "m"])
+    def test_tenor_to_years_malformed(self, tenor):
+        """Test that tenors that are not a number followed by a unit result in null."""
+        result = pl.DataFrame({"Tenor": [tenor]}).select(tenor_to_years(pl.col("Tenor"))).item()
+
+        assert result is None
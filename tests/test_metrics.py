@@ -1,16 +1,24 @@
+import datetime
+
 import polars as pl
 import pytest
 
+from bank_projections.financials.balance_sheet_metric_registry import BalanceSheetMetrics
 from bank_projections.financials.balance_sheet_metrics import (
     BalanceSheetMetric,
     BaselExposure,
     BookValue,
     DerivedMetric,
+    DerivedWeight,
+    DirtyPrice,
     MarketValue,
     StoredAmount,
     StoredColumn,
     StoredWeight,
 )
+from bank_projections.metrics.metrics import MetricRegistry, metrics_frame
+from bank_projections.metrics.profitability import calculate_profitability
+from bank_projections.utils.time import TimeHorizon
 
 
 class TestBalanceSheetMetric:
@@ -43,6 +51,11 @@ class TestStoredAmount:
         result = metric.set_expression(amount_value)
         assert isinstance(result, pl.Expr)
 
+    def test_set_expression_passes_expressions_through(self):
+        metric = StoredAmount("TestColumn")
+        amounts = pl.col("Other") * 2
+        assert metric.set_expression(amounts) is amounts
+
     def test_aggregation_expression(self):
         metric = StoredAmount("TestColumn")
         expr = metric.aggregation_expression
@@ -54,6 +67,15 @@ class TestStoredAmount:
         result = metric.mutation_expression(100.0, filter_expr)
         assert isinstance(result, pl.Expr)
 
+    def test_mutation_expression_values(self):
+        """Test that mutations are allocated pro rata, and evenly when the allocations sum to zero"""
+        metric = StoredAmount("TestColumn")
+        df = pl.DataFrame({"Nominal": [1.0, 3.0, 0.0, 0.0], "Group": ["a", "a", "b", "b"]})
+        pro_rata = df.select(metric.mutation_expression(100.0, pl.col("Group") == "a"))
+        even = df.select(metric.mutation_expression(100.0, pl.col("Group") == "b"))
+        assert pro_rata.to_series().to_list()[:2] == [25.0, 75.0]
+        assert even.to_series().to_list()[2:] == [50.0, 50.0]
+
     def test_mutation_column(self):
         metric = StoredAmount("TestColumn")
         assert metric.mutation_column == "TestColumn"
@@ -85,6 +107,13 @@ class TestStoredWeight:
         expr = metric.aggregation_expression
         assert isinstance(expr, pl.Expr)
 
+    def test_aggregation_expression_values(self):
+        """Test the weighted average, falling back to the plain mean when the weights sum to zero"""
+        metric = StoredWeight("TestColumn")
+        df = pl.DataFrame({"TestColumn": [0.1, 0.2, 0.3, 0.5], "Nominal": [1.0, 3.0, 0.0, 0.0], "Group": [1, 1, 2, 2]})
+        result = df.group_by("Group").agg(metric.aggregation_expression).sort("Group")
+        assert result["TestColumn"].to_list() == pytest.approx([0.175, 0.4])
+
     def test_mutation_expression(self):
         metric = StoredWeight("TestColumn")
         filter_expr = pl.col("AssetType") == "Mortgages"
@@ -96,6 +125,32 @@ class TestStoredWeight:
         assert metric.mutation_column == "TestColumn"
 
 
+class TestZeroDenominators:
+    """Ratios over a zero-nominal row or an empty selection are zero rather than null or inf"""
+
+    @pytest.fixture
+    def df(self) -> pl.DataFrame:
+        return pl.DataFrame(
+            {
+                "Nominal": [0.0, 100.0],
+                "Notional": [0.0, 0.0],
+                "FairValueAdjustment": [0.0, 2.0],
+                "AccruedInterest": [0.0, 1.0],
+                "InterestRate": [0.03, 0.05],
+            }
+        )
+
+    @pytest.mark.parametrize("metric, expected", [(DirtyPrice(), 1.03), (DerivedWeight("AccruedInterest"), 0.01)])
+    def test_zero_nominal_row(self, df, metric, expected):
+        result = df.select(metric.get_expression.alias("value"))["value"].to_list()
+        assert result == pytest.approx([0.0, expected])
+
+    @pytest.mark.parametrize("metric", [DirtyPrice(), DerivedWeight("AccruedInterest"), StoredWeight("InterestRate")])
+    def test_empty_selection(self, df, metric):
+        result = df.filter(pl.lit(False)).select(metric.aggregation_expression.alias("value"))
+        assert result["value"].to_list() == [0.0]
+
+
 class TestDerivedMetric:
     def test_derived_metric_is_abstract(self):
         """Test that DerivedMetric cannot be instantiated directly"""
@@ -162,6 +217,26 @@ class TestBookValue:
         expr = metric.aggregation_expression
         assert isinstance(expr, pl.Expr)
 
+    def test_expressions_are_cached(self):
+        metric = BookValue()
+        assert metric.get_expression is metric.get_expression
+        assert metric.aggregation_expression is metric.aggregation_expression
+
+
+def test_trea_metrics_share_exposure_expression():
+    """Test that TREA and its weight are built on the same exposure expression object"""
+    trea_weight = BalanceSheetMetrics.get("TREAWeight")
+    trea = BalanceSheetMetrics.get("TREA")
+    assert trea_weight.weight_expr is trea.allocation_expr
+
+
+@pytest.mark.parametrize("name", list(BalanceSheetMetrics.items))
+def test_registered_metric_expressions_are_cached(name):
+    """Test that no registered metric rebuilds its expressions on every access"""
+    metric = BalanceSheetMetrics.get(name)
+    assert metric.get_expression is metric.get_expression
+    assert metric.aggregation_expression is metric.aggregation_expression
+
 
 class TestMetricIntegration:
     """Integration tests to verify metrics work with actual data"""
@@ -216,3 +291,59 @@ class TestMetricIntegration:
         result = df.select(metric.get_expression.alias("exposure"))
         expected = [1065.0, 2130.0]
         assert result["exposure"].to_list() == expected
+
+
+def test_metrics_frame():
+    """Test that a metrics dict becomes a single Float64 row in insertion order"""
+    df = metrics_frame({"A": 1.5, "B": 2, "C": 0.0})
+    assert df.columns == ["A", "B", "C"]
+    assert df.schema == {"A": pl.Float64, "B": pl.Float64, "C": pl.Float64}
+    assert df.row(0) == (1.5, 2.0, 0.0)
+
+
+def test_composite_metrics_reuse_calculated_building_blocks():
+    """Test that a registered building block already in previous_metrics is not recalculated"""
+    ratio = MetricRegistry.get("CET1 Ratio")
+    # The balance sheet is never touched because both operands are taken from previous_metrics
+    previous_metrics = {"CET1 Capital": 3.0, "TREA": 4.0}
+    assert ratio.calculate(None, previous_metrics) == 0.75
+
+
+def test_calculate_profitability_weights_metrics_by_days():
+    """Test that the monthly outlook averages the metrics over the month, weighted by the days each date covers"""
+    horizon = TimeHorizon([datetime.date(2024, 12, 31), datetime.date(2025, 1, 10), datetime.date(2025, 1, 31)])
+    metric_list = [
+        {"Total Assets": 100.0, "Total Equity": 10.0},
+        {"Total Assets": 200.0, "Total Equity": 10.0},
+        {"Total Assets": 0.0, "Total Equity": 0.0},
+    ]
+    pnls = [pl.DataFrame({"rule": [], "Amount": []}, schema={"rule": pl.String, "Amount": pl.Float64})] + [
+        pl.DataFrame({"rule": ["Accrual"], "Amount": [1.0]})
+    ] * 2
+
+    result = next(r for r in calculate_profitability(metric_list, pnls, horizon) if r["outlook"] == "Monthly")
+
+    assert result["Total Assets"] == pytest.approx((100.0 * 10 + 200.0 * 21) / 31)
+    assert result["Total Equity"] == pytest.approx(10.0)
+    assert result["Net Income"] == pytest.approx(2.0)
+
+
+def test_calculate_profitability_only_reads_steps_since_earliest_outlook_start():
+    """Test that the metrics and pnls before the earliest outlook start are not read again at every month end"""
+    dates = [datetime.date(2024, 6, 30), datetime.date(2024, 7, 31), datetime.date(2024, 8, 31)]
+    dates += [datetime.date(2024, 9, 30), datetime.date(2024, 10, 31), datetime.date(2024, 11, 30)]
+    dates += [datetime.date(2024, 12, 31), datetime.date(2025, 1, 31), datetime.date(2025, 2, 28)]
+    horizon = TimeHorizon([*dates, datetime.date(2025, 3, 31)])
+    # The quarterly outlook starts at 2024-12-31, so earlier steps must not be read; None would fail if they were
+    metric_list = [None] * 6 + [{"Total Assets": float(i), "Total Equity": 10.0} for i in (100, 200, 300, 400)]
+    pnls = [None] * 7 + [pl.DataFrame({"rule": ["Accrual", "Other"], "Amount": [float(i), 1.0]}) for i in (1, 2, 3)]
+
+    results = {r["outlook"]: r for r in calculate_profitability(metric_list, pnls, horizon)}
+
+    assert set(results) == {"Monthly", "Quarterly"}
+    assert results["Monthly"]["Total Assets"] == pytest.approx(300.0)
+    assert results["Quarterly"]["Total Assets"] == pytest.approx((100.0 * 31 + 200.0 * 28 + 300.0 * 31) / 90)
+    assert results["Monthly"]["Net Income"] == pytest.approx(4.0)
+    assert results["Monthly"]["Net Interest Income"] == pytest.approx(3.0)
+    assert results["Quarterly"]["Net Income"] == pytest.approx(9.0)
+    assert results["Quarterly"]["Net Interest Income"] == pytest.approx(6.0)
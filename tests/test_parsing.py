@@ -0,0 +1,29 @@
+"""Unit tests for parsing module."""
+
+import pytest
+
+from bank_projections.utils.parsing import get_identifier, is_in_identifiers, strip_identifier
+
+
+class TestIdentifiers:
+    """Test matching of identifiers that differ in case and separators."""
+
+    def test_strip_identifier(self) -> None:
+        """Test that case, surrounding whitespace and separators are ignored."""
+        assert strip_identifier("  Reference_Item-A/B\\C ") == "referenceitemabc"
+        assert strip_identifier(None) is None
+
+    def test_get_identifier_returns_first_reference(self) -> None:
+        """Test that the first matching reference identifier is returned."""
+        assert get_identifier("book value", ["Nominal", "BookValue", "Book_Value"]) == "BookValue"
+
+    def test_get_identifier_missing(self) -> None:
+        """Test that an unknown identifier raises a KeyError."""
+        with pytest.raises(KeyError, match="Unknown not found"):
+            get_identifier("Unknown", ["Nominal"])
+
+    def test_is_in_identifiers(self) -> None:
+        """Test membership for lists and other iterables."""
+        assert is_in_identifiers("counter item", ["Amount", "Counter Item"])
+        assert is_in_identifiers("amount", {"Amount": 1.0}.keys())
+        assert not is_in_identifiers("item", ["Amount", "Counter Item"])
@@ -1,5 +1,6 @@
 """Unit tests for runoff module."""
 
+import dataclasses
 import datetime
 
 import polars as pl
@@ -11,6 +12,7 @@ from bank_projections.projections.accrual import Accrual
 from bank_projections.projections.agio_redemption import AgioRedemption
 from bank_projections.projections.coupon_payment import CouponPayment
 from bank_projections.projections.redemption import Redemption
+from bank_projections.scenarios.scenario_input_type import BalanceSheetMutationInputItem
 from bank_projections.utils.time import TimeIncrement
 
 
@@ -120,3 +122,22 @@ class TestRunoff:
         # Should preserve row count and basic columns
         assert len(result_bs._data) == initial_rows
         assert initial_columns.issubset(set(result_bs._data.columns))
+
+    @pytest.mark.parametrize("metric", ["repayment", "prepayment"])
+    def test_repayment_mutation_on_zero_nominal(self, bs, minimal_scenario_snapshot, metric) -> None:
+        """Test that a repayment mutation on an item without nominal redeems nothing instead of producing NaN."""
+        increment = TimeIncrement(from_date=datetime.date(2024, 12, 31), to_date=datetime.date(2025, 1, 31))
+        item = BalanceSheetItem(SubItemType="Mortgages")
+        bs._data = bs._data.with_columns(Nominal=pl.when(item.filter_expression).then(0.0).otherwise(pl.col("Nominal")))
+        mutation = BalanceSheetMutationInputItem({"Amount": 100.0, "metric": metric})
+        mutation.item = item
+        snapshot = dataclasses.replace(
+            minimal_scenario_snapshot, mutations=[*minimal_scenario_snapshot.mutations, mutation]
+        )
+
+        result_bs = Redemption().apply(bs, increment, snapshot)
+
+        assert result_bs._data["Nominal"].is_nan().sum() == 0
+        assert result_bs._data.filter(item.filter_expression)["Nominal"].to_list() == pytest.approx(
+            [0.0] * len(result_bs._data.filter(item.filter_expression))
+        )
@@ -1,11 +1,13 @@
 """Tests for scenario module."""
 
+import dataclasses
 import datetime
 
 import pandas as pd
 
 from bank_projections.scenarios.excel_sheet_format import KeyValueInput, TableInput
 from bank_projections.scenarios.scenario import Scenario, ScenarioSnapShot
+from bank_projections.scenarios.scenario_input_type import BalanceSheetMutationInputItem, CurveInput
 from bank_projections.utils.time import TimeIncrement
 
 
@@ -64,6 +66,29 @@ class TestScenario:
         assert snapshot.audit is not None
 
 
+class TestCurveInput:
+    """Test CurveInput functionality."""
+
+    def test_mixed_type_columns(self):
+        """Test that Excel columns mixing strings and numbers are coerced like the other rows."""
+        curve_data_df = pd.DataFrame(
+            {
+                "Date": [datetime.date(2024, 1, 1), "2024-01-01"],
+                "Name": ["euribor", "euribor"],
+                "Tenor": ["3m", 6],
+                "Type": ["spot", "zero"],
+                "Rate": [0.03, "0.04"],
+                "Maturity": ["3m", "5Y"],
+            }
+        )
+        curve_input = CurveInput([TableInput(table=curve_data_df, general_tags={}, template_name="interestrates")])
+
+        assert curve_input.data["Date"].to_list() == [datetime.date(2024, 1, 1)] * 2
+        assert curve_input.data["Tenor"].to_list() == ["3m", "6"]
+        assert curve_input.data["Rate"].to_list() == [0.03, 0.04]
+        assert curve_input.data["MaturityYears"].to_list() == [0.25, 5.0]
+
+
 class TestScenarioSnapShot:
     """Test ScenarioSnapShot functionality."""
 
@@ -75,3 +100,13 @@ class TestScenarioSnapShot:
         """Test that production is available in snapshot (may be empty list)."""
         assert minimal_scenario_snapshot.production is not None
         assert isinstance(minimal_scenario_snapshot.production, list)
+
+    def test_mutations_for_groups_by_metric(self, minimal_scenario_snapshot):
+        """Test that mutations_for returns the mutations of one projection metric, in input order."""
+        accruals = [BalanceSheetMutationInputItem({"Amount": amount, "metric": "accrual"}) for amount in (1.0, 2.0)]
+        coupon = BalanceSheetMutationInputItem({"Amount": 3.0, "metric": "couponpayment"})
+        snapshot = dataclasses.replace(minimal_scenario_snapshot, mutations=[accruals[0], coupon, accruals[1]])
+
+        assert snapshot.mutations_for("accrual") == accruals
+        assert snapshot.mutations_for("couponpayment") == [coupon]
+        assert snapshot.mutations_for("agioredemption") == []
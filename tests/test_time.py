@@ -288,6 +288,15 @@ class TestTimeHorizon:
         assert horizon.start_date == datetime.date(2024, 1, 1)
         assert horizon.end_date == datetime.date(2024, 3, 1)
 
+    def test_index_of(self) -> None:
+        """Test index_of returns the position of a horizon date and None otherwise."""
+        dates = [datetime.date(2024, 3, 1), datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)]
+        horizon = TimeHorizon(dates)
+
+        assert horizon.index_of(datetime.date(2024, 1, 1)) == 0
+        assert horizon.index_of(datetime.date(2024, 3, 1)) == 2
+        assert horizon.index_of(datetime.date(2024, 1, 15)) is None
+
 
 class TestTimeHorizonConfig:
     """Test TimeHorizonConfig Pydantic model."""